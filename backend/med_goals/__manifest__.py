@@ -17,6 +17,7 @@ scoring configuration and computed rankings / top performers per employee.
     "data": [
         "security/med_goals_security.xml",
         "security/ir.model.access.csv",
+        "data/med_goals_cron.xml",
         "views/med_menus.xml",
         "views/area_views.xml",
         "views/specialty_views.xml",
@@ -1,12 +1,113 @@
+import csv
+import hashlib
+import hmac
+import io
 import json
 import math
+from datetime import timezone
 from urllib.parse import urlencode
 
-from odoo import http, _
+from odoo import api, http, _
 from odoo.http import request
+from odoo.modules.registry import Registry
 from odoo.exceptions import AccessError
-
-from ..services.serializers import RecordSerializer
+from ..models.med_performance_log_queue import LogQueueFull
+
+from ..services import metrics
+from ..services.cache import payload_cache
+from ..services.pagination import InvalidCursor, keyset_page
+from ..services.serializers import RecordSerializer, RowEncoder, dumps
+
+
+# Campos del scoreboard (JSON-RPC y exportación)
+SCOREBOARD_FIELDS = [
+    "employee_id",
+    "score_total",
+    "score_goals",
+    "score_productivity",
+    "score_quality",
+    "score_economic",
+    "rank_global",
+    "rank_area",
+    "rank_specialty",
+    "is_top_performer",
+]
+
+# Exportación en streaming del scoreboard
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+EXPORT_CSV_HEADER = ["employee_id", "employee_name"] + SCOREBOARD_FIELDS[1:]
+
+# Orden estable para la paginación por cursor
+EMPLOYEE_KEYS = [("name", "asc"), ("id", "asc")]
+SCORE_KEYS = [("score_total", "desc"), ("id", "asc")]
+SCORES_MAX_LIMIT = 500
+
+# Historial de scores por empleado
+SCORE_HISTORY_FIELDS = [
+    "cycle_id",
+    "score_total",
+    "score_goals",
+    "score_productivity",
+    "score_quality",
+    "score_economic",
+    "rank_global",
+    "rank_area",
+    "rank_specialty",
+    "is_top_performer",
+    "create_date",
+]
+SCORE_HISTORY_KEYS = [("create_date", "desc"), ("id", "desc")]
+DETAIL_HISTORY_LIMIT = 5     # ciclos incluidos en el detalle del empleado
+HISTORY_MAX_LIMIT = 500
+
+# Feed de actividad (historial de evaluaciones)
+FEED_KEYS = [("create_date", "desc"), ("id", "desc")]
+FEED_EMPLOYEE_LIMIT = 100    # un empleado: cubre años de ciclos en una página
+FEED_COMPANY_LIMIT = 50      # toda la compañía: solo la actividad reciente
+FEED_MAX_LIMIT = 500
+
+# Bloques del dashboard / portal
+DASHBOARD_TOP_FIELDS = ["employee_id", "score_total", "rank_global", "is_top_performer"]
+MY_SCORE_FIELDS = [
+    "score_total",
+    "score_goals",
+    "score_productivity",
+    "score_quality",
+    "score_economic",
+    "rank_global",
+    "rank_area",
+    "rank_specialty",
+    "is_top_performer",
+]
+
+# Ingesta masiva de performance logs
+BULK_MAX_ROWS = 50000
+
+# Los scoreboards se leen de la tabla desnormalizada med.leaderboard
+LEADERBOARD_FIELDS = SCOREBOARD_FIELDS + ["employee_name"]
+LEADERBOARD_PAIRS = {"employee": ("employee_id", "employee_name")}
+
+# API pública de empleados
+PUBLIC_EMPLOYEE_FIELDS = [
+    "name",
+    "job_title",
+    "work_email",
+    "work_phone",
+    "med_area_id",
+    "med_specialty_id",
+    "last_score",
+    "last_evaluation_date",
+    "is_top_performer",
+    "rank_area",
+    "rank_specialty",
+]
+PUBLIC_EMPLOYEE_RENAME = {"med_area_id": "area", "med_specialty_id": "specialty"}
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
 
 
 def _ensure_group(group_xmlid):
@@ -15,6 +116,31 @@ def _ensure_group(group_xmlid):
         raise AccessError(_("You do not have access to this resource."))
 
 
+def _page_limit(value, default, maximum):
+    """
+    Tamaño de página del payload: entero positivo acotado a ``maximum``.
+    Lanza ValueError si no es un entero o es <= 0.
+    """
+    try:
+        limit = int(default if value is None else value)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer") from None
+    if limit <= 0:
+        raise ValueError("limit must be a positive integer")
+    return min(limit, maximum)
+
+
+def _page_offset(value):
+    """Offset de clientes antiguos: entero >= 0. Lanza ValueError si no lo es."""
+    try:
+        offset = int(value or 0)
+    except (TypeError, ValueError):
+        raise ValueError("offset must be an integer") from None
+    if offset < 0:
+        raise ValueError("offset must not be negative")
+    return offset
+
+
 class MedGoalsApi(http.Controller):
     serializer = RecordSerializer()
 
@@ -37,62 +163,96 @@ class MedGoalsApi(http.Controller):
         page = max(page, 1)
         page_size = max(1, min(page_size, 100))
 
-        domain = [("company_id", "=", request.env.company.id)]
-        total = Employee.search_count(domain)
-        pages = math.ceil(total / page_size) if page_size else 1
+        company_id = request.env.company.id
+        domain = [("company_id", "=", company_id)]
 
-        employees = Employee.search(
-            domain,
-            limit=page_size,
-            offset=(page - 1) * page_size,
-            order="name asc",
-        )
+        # GET condicional: el validador sale de agregados baratos, así un
+        # 304 no lee ni serializa ningún empleado.
+        total, last_modified = self._public_employees_validators(company_id, domain)
+        etag = self._public_employees_etag(company_id, total, last_modified)
+        if self._is_not_modified(etag, last_modified):
+            response = http.Response(status=304)
+            self._set_validators(response, etag, last_modified)
+            return response
 
-        data = employees.read(
-            [
-                "name",
-                "job_title",
-                "work_email",
-                "work_phone",
-                "med_area_id",
-                "med_specialty_id",
-                "last_score",
-                "last_evaluation_date",
-                "is_top_performer",
-                "rank_area",
-                "rank_specialty",
-            ]
-        )
+        pages = math.ceil(total / page_size) if page_size else 1
 
-        for rec in data:
-            self.serializer.map_many2one(
-                rec,
-                {
-                    "med_area_id": "area",
-                    "med_specialty_id": "specialty",
-                },
+        # Paginación por cursor (keyset sobre name, id). "page" se mantiene para
+        # clientes antiguos: solo fija el offset de la primera petición.
+        try:
+            data, next_cursor, prev_cursor = keyset_page(
+                Employee,
+                domain,
+                EMPLOYEE_KEYS,
+                page_size,
+                fields=PUBLIC_EMPLOYEE_FIELDS,
+                cursor=kwargs.get("cursor"),
+                offset=(page - 1) * page_size,
             )
+        except InvalidCursor as exc:
+            return self._json_response({"error": str(exc)}, status=400)
+
+        encoder = RowEncoder.for_fields(Employee, ["id"] + PUBLIC_EMPLOYEE_FIELDS, rename=PUBLIC_EMPLOYEE_RENAME)
+        data = encoder.encode_many(data)
 
         base_url = request.httprequest.base_url
 
-        def build_url(target_page):
+        def build_url(cursor):
             params = request.httprequest.args.to_dict(flat=True)
-            params.update({"page": target_page, "page_size": page_size})
+            params.pop("page", None)
+            params.update({"cursor": cursor, "page_size": page_size})
             return f"{base_url}?{urlencode(params)}"
 
+        # El conteo sale del mismo agregado que el ETag, no cuesta otra consulta.
         info = {
             "count": total,
             "pages": pages,
-            "next": build_url(page + 1) if page < pages else None,
-            "prev": build_url(page - 1) if page > 1 else None,
+            "next": build_url(next_cursor) if next_cursor else None,
+            "prev": build_url(prev_cursor) if prev_cursor else None,
         }
 
-        payload = {"info": info, "results": data}
-        return http.Response(
-            json.dumps(payload, default=str),
-            status=200,
-            headers={"Content-Type": "application/json"},
+        response = self._json_response({"info": info, "results": data})
+        self._set_validators(response, etag, last_modified)
+        return response
+
+    def _public_employees_validators(self, company_id, domain):
+        """
+        (count, last_modified) de la lista pública. Los valores de score
+        (last_score, rank_*...) los copia _refresh_last_score junto con
+        hr_employee.write_date; áreas y especialidades se incluyen porque sus
+        nombres salen en el payload sin tocar el empleado.
+        """
+        env = request.env
+        [(total, last_modified)] = env["hr.employee"].sudo()._read_group(
+            domain, aggregates=["__count", "write_date:max"]
         )
+        stamps = [last_modified]
+        for model in ("med.area", "med.specialty"):
+            [(stamp,)] = env[model].sudo()._read_group(
+                [("company_id", "=", company_id)], aggregates=["write_date:max"]
+            )
+            stamps.append(stamp)
+        stamps = [stamp for stamp in stamps if stamp]
+        last_modified = max(stamps).replace(tzinfo=timezone.utc, microsecond=0) if stamps else None
+        return total, last_modified
+
+    def _public_employees_etag(self, company_id, total, last_modified):
+        """ETag fuerte: compañía, conteo, última modificación y parámetros de página."""
+        args = sorted(request.httprequest.args.items(multi=True))
+        raw = repr((company_id, total, last_modified and last_modified.isoformat(), args))
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _is_not_modified(self, etag, last_modified):
+        httprequest = request.httprequest
+        if "If-None-Match" in httprequest.headers:
+            return httprequest.if_none_match.contains_weak(etag)
+        since = httprequest.if_modified_since
+        return bool(since and last_modified and last_modified <= since)
+
+    def _set_validators(self, response, etag, last_modified):
+        response.set_etag(etag)
+        if last_modified:
+            response.last_modified = last_modified
 
     def _get_current_employee(self):
         """Devuelve el hr.employee vinculado al usuario actual."""
@@ -105,7 +265,56 @@ class MedGoalsApi(http.Controller):
             limit=1,
         )
         return employee
-    
+
+    def _company_key(self):
+        return tuple(sorted(request.env.user.company_ids.ids))
+
+    def _resolve_cycle(self, cycle_id=None):
+        """
+        Ciclo pedido explícitamente, o el ABIERTO más reciente con fallback
+        al último CERRADO. La resolución se cachea por conjunto de compañías.
+        """
+        Cycle = request.env["med.evaluation.cycle"].sudo()
+        if cycle_id:
+            return Cycle.browse(cycle_id)
+
+        company_ids = list(self._company_key())
+
+        def resolve():
+            cycle = Cycle.search(
+                [("state", "=", "open"), ("company_id", "in", company_ids)],
+                limit=1,
+                order="date_start desc",
+            )
+            if not cycle:
+                cycle = Cycle.search(
+                    [("state", "=", "closed"), ("company_id", "in", company_ids)],
+                    limit=1,
+                    order="date_end desc",
+                )
+            return cycle.id
+
+        return Cycle.browse(payload_cache.get_or_set(("cycle", tuple(company_ids)), resolve))
+
+    def _top_performers_payload(self, cycle, limit, fields):
+        """Top-N del ciclo + info del ciclo, cacheado por (compañías, ciclo, límite, campos)."""
+        Leaderboard = request.env["med.leaderboard"].sudo()
+
+        def build():
+            scores = Leaderboard.search_read(
+                [("cycle_id", "=", cycle.id)],
+                fields=list(fields) + ["employee_name"],
+                limit=limit,
+                order="score_total desc, id",
+                load=None,
+            )
+            encoder = RowEncoder.for_fields(Leaderboard, ["id"] + list(fields), pairs=LEADERBOARD_PAIRS)
+            cycle_info = cycle.read(["id", "name", "date_start", "date_end", "state"])[0]
+            return {"cycle": cycle_info, "records": encoder.encode_many(scores)}
+
+        key = ("top_performers", self._company_key(), cycle.id, limit, tuple(fields))
+        return payload_cache.get_or_set(key, build)
+
 
     # =========================================================
     # 2) DETALLE DE EMPLEADO + HISTORIAL DE SCORES
@@ -151,23 +360,17 @@ class MedGoalsApi(http.Controller):
             },
         )
 
-        scores = Score.search_read(
+        # Solo los últimos N ciclos; el resto se pagina con /scores
+        try:
+            history_limit = _page_limit(payload.get("history_limit"), DETAIL_HISTORY_LIMIT, HISTORY_MAX_LIMIT)
+        except ValueError as exc:
+            return {"status": "error", "message": str(exc)}
+        scores, history_cursor, _prev = keyset_page(
+            Score,
             [("employee_id", "=", employee.id)],
-            fields=[
-                "id",
-                "cycle_id",
-                "score_total",
-                "score_goals",
-                "score_productivity",
-                "score_quality",
-                "score_economic",
-                "rank_global",
-                "rank_area",
-                "rank_specialty",
-                "is_top_performer",
-                "create_date",
-            ],
-            order="create_date desc",
+            SCORE_HISTORY_KEYS,
+            history_limit,
+            fields=SCORE_HISTORY_FIELDS,
         )
 
         for s in scores:
@@ -177,8 +380,66 @@ class MedGoalsApi(http.Controller):
             "status": "ok",
             "employee": employee_info,
             "score_history": scores,
+            "score_history_next_cursor": history_cursor,
         }
 
+    @http.route(
+        "/med_goals/api/employees/<int:employee_id>/scores",
+        type="json",
+        auth="user",
+        methods=["POST"],
+        csrf=False,
+    )
+    def get_score_history(self, employee_id, **payload):
+        """
+        Historial de scores paginado por cursor (más reciente primero).
+        Parámetros: limit, cursor, fields (subconjunto de SCORE_HISTORY_FIELDS),
+        since (fecha mínima de create_date) y format="columnar" para recibir
+        arrays paralelos por campo en lugar de un dict por fila.
+        """
+        _ensure_group("med_goals.group_med_goals_user")
+
+        fields = payload.get("fields") or SCORE_HISTORY_FIELDS
+        unknown = set(fields) - set(SCORE_HISTORY_FIELDS)
+        if unknown:
+            return {"status": "error", "message": f"Unknown fields: {', '.join(sorted(unknown))}"}
+        try:
+            limit = _page_limit(payload.get("limit"), 50, HISTORY_MAX_LIMIT)
+        except ValueError as exc:
+            return {"status": "error", "message": str(exc)}
+
+        domain = [("employee_id", "=", employee_id)]
+        if payload.get("since"):
+            domain.append(("create_date", ">=", payload["since"]))
+
+        try:
+            scores, next_cursor, prev_cursor = keyset_page(
+                request.env["med.employee.score"].sudo(),
+                domain,
+                SCORE_HISTORY_KEYS,
+                limit,
+                fields=list(fields),
+                cursor=payload.get("cursor"),
+            )
+        except InvalidCursor as exc:
+            return {"status": "error", "message": str(exc)}
+
+        result = {"status": "ok", "next_cursor": next_cursor, "prev_cursor": prev_cursor}
+        if payload.get("format") == "columnar":
+            columns = ["id"] + [f for f in fields if f != "cycle_id"]
+            if "cycle_id" in fields:
+                for rec in scores:
+                    cycle = rec.pop("cycle_id") or (None, None)
+                    rec["cycle_id"], rec["cycle_name"] = cycle[0], cycle[1]
+                columns += ["cycle_id", "cycle_name"]
+            result.update(self.serializer.to_columnar(scores, columns))
+        else:
+            for rec in scores:
+                if "cycle_id" in rec:
+                    self.serializer.map_many2one(rec, {"cycle_id": "cycle"})
+            result["records"] = scores
+        return result
+
     # =========================================================
     # 3) LISTA DE CICLOS Y SCOREBOARD
     # =========================================================
@@ -217,42 +478,133 @@ class MedGoalsApi(http.Controller):
 
         area_id = payload.get("area_id")
         specialty_id = payload.get("specialty_id")
-        limit = payload.get("limit", 100)
-        offset = payload.get("offset", 0)
+        try:
+            limit = _page_limit(payload.get("limit"), 100, SCORES_MAX_LIMIT)
+            offset = _page_offset(payload.get("offset"))
+        except ValueError as exc:
+            return {"status": "error", "message": str(exc)}
+
+        Leaderboard = request.env["med.leaderboard"].sudo()
+        domain = self._cycle_scores_domain(cycle_id, area_id, specialty_id)
+
+        # Paginación por cursor (score_total desc, id); "offset" solo para la
+        # primera página de clientes antiguos.
+        try:
+            scores, next_cursor, prev_cursor = keyset_page(
+                Leaderboard,
+                domain,
+                SCORE_KEYS,
+                limit,
+                fields=LEADERBOARD_FIELDS,
+                cursor=payload.get("cursor"),
+                offset=offset,
+                load=None,
+            )
+        except InvalidCursor as exc:
+            return {"status": "error", "message": str(exc)}
 
-        Score = request.env["med.employee.score"].sudo()
+        encoder = RowEncoder.for_fields(Leaderboard, ["id"] + LEADERBOARD_FIELDS, pairs=LEADERBOARD_PAIRS)
+        result = {
+            "status": "ok",
+            "records": encoder.encode_many(scores),
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+        }
+        # El COUNT exacto es opcional (with_count) o para clientes por offset
+        if payload.get("with_count") or "offset" in payload:
+            result["count"] = Leaderboard.search_count(domain)
+        return result
 
-        domain = [("cycle_id", "=", cycle_id)]
-        if area_id:
-            domain.append(("employee_id.med_area_id", "=", area_id))
-        if specialty_id:
-            domain.append(("employee_id.med_specialty_id", "=", specialty_id))
+    @http.route(
+        "/med_goals/api/evaluation_cycles/<int:cycle_id>/scores/export",
+        type="http",
+        auth="user",
+        methods=["GET"],
+        csrf=False,
+    )
+    def export_cycle_scores(self, cycle_id, **kwargs):
+        """
+        Exporta el scoreboard completo del ciclo como NDJSON (por defecto) o CSV.
+        Se genera en streaming por bloques: la memoria no depende del tamaño del ciclo.
+        """
+        _ensure_group("med_goals.group_med_goals_user")
 
-        scores = Score.search_read(
-            domain,
-            fields=[
-                "employee_id",
-                "score_total",
-                "score_goals",
-                "score_productivity",
-                "score_quality",
-                "score_economic",
-                "rank_global",
-                "rank_area",
-                "rank_specialty",
-                "is_top_performer",
+        fmt = (kwargs.get("format") or "ndjson").lower()
+        if fmt not in EXPORT_CONTENT_TYPES:
+            return self._json_response({"error": "Unsupported format, use ndjson or csv."}, status=400)
+
+        domain = self._cycle_scores_domain(
+            cycle_id,
+            int(kwargs["area_id"]) if kwargs.get("area_id") else None,
+            int(kwargs["specialty_id"]) if kwargs.get("specialty_id") else None,
+        )
+        filename = f"cycle_{cycle_id}_scores.{fmt}"
+        return http.Response(
+            self._stream_scores(domain, fmt),
+            status=200,
+            headers=[
+                ("Content-Type", EXPORT_CONTENT_TYPES[fmt]),
+                ("Content-Disposition", f'attachment; filename="{filename}"'),
             ],
-            limit=limit,
-            offset=offset,
-            order="score_total desc",
+            direct_passthrough=True,
         )
 
-        for rec in scores:
-            self.serializer.map_many2one(rec, {"employee_id": "employee"})
-
-        total = Score.search_count(domain)
+    def _cycle_scores_domain(self, cycle_id, area_id=None, specialty_id=None):
+        domain = [("cycle_id", "=", cycle_id)]
+        if area_id:
+            domain.append(("area_id", "=", area_id))
+        if specialty_id:
+            domain.append(("specialty_id", "=", specialty_id))
+        return domain
 
-        return {"status": "ok", "count": total, "records": scores}
+    def _stream_scores(self, domain, fmt):
+        """
+        Generador de la exportación. El cursor de la petición ya está cerrado
+        cuando se consume el cuerpo, así que abre el suyo propio; al ser una sola
+        transacción todos los bloques ven la misma foto de los datos.
+        """
+        dbname = request.env.cr.dbname
+        uid = request.env.uid
+        context = dict(request.env.context)
+
+        def generate():
+            registry = Registry(dbname)
+            with registry.cursor() as cr:
+                env = api.Environment(cr, uid, context)
+                Leaderboard = env["med.leaderboard"].sudo()
+                encoder = RowEncoder.for_fields(Leaderboard, ["id"] + LEADERBOARD_FIELDS, pairs=LEADERBOARD_PAIRS)
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                if fmt == "csv":
+                    writer.writerow(EXPORT_CSV_HEADER)
+
+                cursor = None
+                while True:
+                    rows, cursor, _prev = keyset_page(
+                        Leaderboard,
+                        domain,
+                        SCORE_KEYS,
+                        EXPORT_CHUNK_SIZE,
+                        LEADERBOARD_FIELDS,
+                        cursor=cursor,
+                        load=None,
+                    )
+                    if fmt == "csv":
+                        for rec in rows:
+                            writer.writerow(
+                                [rec["employee_id"], rec["employee_name"]]
+                                + [rec[f] for f in EXPORT_CSV_HEADER[2:]]
+                            )
+                        yield buffer.getvalue().encode()
+                        buffer.seek(0)
+                        buffer.truncate()
+                    else:
+                        yield b"".join(dumps(rec) + b"\n" for rec in encoder.encode_many(rows))
+                    env.invalidate_all()
+                    if not cursor:
+                        break
+
+        return generate()
 
 
     # =========================================================
@@ -273,27 +625,7 @@ class MedGoalsApi(http.Controller):
         _ensure_group("med_goals.group_med_goals_user")
 
         limit = payload.get("limit", 10)
-        cycle_id = payload.get("cycle_id")
-
-        Cycle = request.env["med.evaluation.cycle"].sudo()
-        Score = request.env["med.employee.score"].sudo()
-
-        if cycle_id:
-            cycle = Cycle.browse(cycle_id)
-        else:
-            # CAMBIO PRINCIPAL: Priorizar 'open', si no hay 'open', buscar 'closed'
-            cycle = Cycle.search(
-                [("state", "=", "open"), ("company_id", "in", request.env.user.company_ids.ids)],
-                limit=1,
-                order="date_start desc",
-            )
-            # Fallback opcional: si no hay abierto, traer el último cerrado
-            if not cycle:
-                cycle = Cycle.search(
-                    [("state", "=", "closed"), ("company_id", "in", request.env.user.company_ids.ids)],
-                    limit=1,
-                    order="date_end desc",
-                )
+        cycle = self._resolve_cycle(payload.get("cycle_id"))
 
         if not cycle:
             return {
@@ -303,11 +635,12 @@ class MedGoalsApi(http.Controller):
                 "message": "No active or closed evaluation cycle found.",
             }
 
-        # NOTA: Para ciclos abiertos, los scores pueden estar vacíos si no se ha ejecutado
-        # el cálculo. Asegúrate de tener un Cron o calcularlos dinámicamente si es necesario.
-        scores = Score.search_read(
-            [("cycle_id", "=", cycle.id)],
-            fields=[
+        # NOTA: Para ciclos abiertos, los scores los mantiene el cron de live scoring
+        # (med.evaluation.cycle._cron_live_scoring), por lo que aquí solo se leen.
+        top = self._top_performers_payload(
+            cycle,
+            limit,
+            [
                 "employee_id",
                 "score_total",
                 "rank_global",
@@ -315,19 +648,12 @@ class MedGoalsApi(http.Controller):
                 "rank_specialty",
                 "is_top_performer",
             ],
-            limit=limit,
-            order="score_total desc",
         )
 
-        for rec in scores:
-            self.serializer.map_many2one(rec, {"employee_id": "employee"})
-
-        cycle_info = cycle.read(["id", "name", "date_start", "date_end", "state"])[0]
-
         return {
             "status": "ok",
-            "cycle": cycle_info,
-            "records": scores,
+            "cycle": top["cycle"],
+            "records": top["records"],
         }
 
     # =========================================================
@@ -375,28 +701,46 @@ class MedGoalsApi(http.Controller):
         
         if payload.get("employee_id"):
             domain.append(("employee_id", "=", payload.get("employee_id")))
+        if payload.get("cycle_id"):
+            domain.append(("cycle_id", "=", payload.get("cycle_id")))
+        if payload.get("date_from"):
+            domain.append(("create_date", ">=", payload.get("date_from")))
+        if payload.get("date_to"):
+            domain.append(("create_date", "<=", payload.get("date_to")))
         
         # Nota: assignment_id no aplica a scores globales, se ignora si viene en payload
-        
-        scores = request.env["med.employee.score"].sudo().search_read(
-            domain,
-            fields=[
-                "id", 
-                "employee_id", 
-                "cycle_id", 
-                "score_total", 
-                "score_goals", 
-                "score_productivity",
-                "score_quality",
-                "score_economic",
-                "rank_global", 
-                "rank_area", 
-                "rank_specialty", 
-                "is_top_performer",
-                "create_date"
-            ],
-            order="create_date desc, id desc",
-        )
+
+        # Feed acotado: página por cursor (create_date, id), tamaño por defecto
+        # según el alcance (un empleado o toda la compañía).
+        try:
+            limit = _page_limit(payload.get("limit"), self._activity_feed_limit(payload), FEED_MAX_LIMIT)
+        except ValueError as exc:
+            return {"status": "error", "message": str(exc)}
+        try:
+            scores, next_cursor, prev_cursor = keyset_page(
+                request.env["med.employee.score"].sudo(),
+                domain,
+                FEED_KEYS,
+                limit,
+                fields=[
+                    "id", 
+                    "employee_id", 
+                    "cycle_id", 
+                    "score_total", 
+                    "score_goals", 
+                    "score_productivity",
+                    "score_quality",
+                    "score_economic",
+                    "rank_global", 
+                    "rank_area", 
+                    "rank_specialty", 
+                    "is_top_performer",
+                    "create_date"
+                ],
+                cursor=payload.get("cursor"),
+            )
+        except InvalidCursor as exc:
+            return {"status": "error", "message": str(exc)}
         
         for s in scores:
             self.serializer.map_many2one(
@@ -412,7 +756,13 @@ class MedGoalsApi(http.Controller):
             cycle_name = s["cycle"]["name"] if s["cycle"] else "General"
             s["name"] = f"Evaluación: {cycle_name}"
             
-        return {"status": "ok", "records": scores}
+        return {"status": "ok", "records": scores, "next_cursor": next_cursor, "prev_cursor": prev_cursor}
+
+    def _activity_feed_limit(self, payload):
+        ICP = request.env["ir.config_parameter"].sudo()
+        if payload.get("employee_id"):
+            return int(ICP.get_param("med_goals.activity_feed_employee_limit", FEED_EMPLOYEE_LIMIT))
+        return int(ICP.get_param("med_goals.activity_feed_company_limit", FEED_COMPANY_LIMIT))
 
     @http.route("/med_goals/api/performance_logs/create", type="json", auth="user", methods=["POST"], csrf=False)
     def create_performance_log(self, **payload):
@@ -430,6 +780,80 @@ class MedGoalsApi(http.Controller):
         log = request.env["med.performance.log"].sudo().create(vals)
         return {"status": "ok", "id": log.id}
 
+    @http.route(
+        "/med_goals/api/performance_logs/bulk",
+        type="http",
+        auth="user",
+        methods=["POST"],
+        csrf=False,
+    )
+    def bulk_create_performance_logs(self, **kwargs):
+        """
+        Ingesta masiva: cuerpo JSON (array o {"records": [...]}) o NDJSON
+        (un log por línea). Devuelve un resultado por fila, en el mismo orden;
+        "idempotency_key" por fila hace seguros los reintentos.
+
+        Con ?mode=async (o med_goals.log_ingestion_mode = async) las filas solo
+        se encolan en med.performance.log.queue y se responde 202; el cron las
+        vuelca después. Si la cola está llena se responde 503 + Retry-After.
+        """
+        _ensure_group("med_goals.group_med_goals_user")
+
+        try:
+            rows = self._parse_bulk_body(request.httprequest)
+        except ValueError as exc:
+            return self._json_response({"status": "error", "message": str(exc)}, status=400)
+        if len(rows) > BULK_MAX_ROWS:
+            return self._json_response(
+                {"status": "error", "message": f"Too many rows, the limit is {BULK_MAX_ROWS}."},
+                status=413,
+            )
+
+        ICP = request.env["ir.config_parameter"].sudo()
+        mode = kwargs.get("mode") or ICP.get_param("med_goals.log_ingestion_mode", "sync")
+        if mode == "async":
+            Queue = request.env["med.performance.log.queue"].sudo()
+            try:
+                queued = Queue._enqueue(rows)
+            except LogQueueFull:
+                response = self._json_response(
+                    {"status": "error", "message": "Ingestion queue is full, retry later."},
+                    status=503,
+                )
+                response.headers["Retry-After"] = str(Queue._get_queue_params()["max_latency"])
+                return response
+            return self._json_response({"status": "accepted", "queued": queued}, status=202)
+
+        results = request.env["med.performance.log"].sudo()._bulk_ingest(rows)
+        summary = {"created": 0, "duplicate": 0, "error": 0}
+        for result in results:
+            summary[result["status"]] += 1
+        return self._json_response({"status": "ok", "summary": summary, "results": results})
+
+    def _parse_bulk_body(self, httprequest):
+        body = httprequest.get_data(as_text=True)
+        if "ndjson" in (httprequest.mimetype or ""):
+            try:
+                return [json.loads(line) for line in body.splitlines() if line.strip()]
+            except ValueError:
+                raise ValueError("Invalid NDJSON body.")
+        try:
+            data = json.loads(body or "[]")
+        except ValueError:
+            raise ValueError("Invalid JSON body.")
+        if isinstance(data, dict):
+            data = data.get("records")
+        if not isinstance(data, list):
+            raise ValueError("Expected an array of records.")
+        return data
+
+    def _json_response(self, payload, status=200):
+        return http.Response(
+            dumps(payload),
+            status=status,
+            headers={"Content-Type": "application/json"},
+        )
+
     # =========================================================
     # 7) GOAL ASSIGNMENTS
     # =========================================================
@@ -466,9 +890,13 @@ class MedGoalsApi(http.Controller):
         employee = self._get_current_employee()
         if not employee: return {"status": "error", "message": "No employee found"}
 
+        assignments = self._my_goals(employee, payload.get("cycle_id"), payload.get("state"))
+        return {"status": "ok", "employee_id": employee.id, "employee_name": employee.name, "records": assignments}
+
+    def _my_goals(self, employee, cycle_id=None, state=None):
         domain = [("company_id", "in", request.env.user.company_ids.ids), ("employee_id", "=", employee.id)]
-        if payload.get("cycle_id"): domain.append(("evaluation_cycle_id", "=", payload.get("cycle_id")))
-        if payload.get("state"): domain.append(("state", "=", payload.get("state")))
+        if cycle_id: domain.append(("evaluation_cycle_id", "=", cycle_id))
+        if state: domain.append(("state", "=", state))
 
         assignments = request.env["med.goal.assignment"].sudo().search_read(
             domain,
@@ -483,7 +911,7 @@ class MedGoalsApi(http.Controller):
                     "evaluation_cycle_id": "cycle",
                 },
             )
-        return {"status": "ok", "employee_id": employee.id, "employee_name": employee.name, "records": assignments}
+        return assignments
 
     # =========================================================
     # 9) DASHBOARD RESUMEN (PORTAL)
@@ -508,6 +936,70 @@ class MedGoalsApi(http.Controller):
         if not employee:
             return {"status": "error", "message": "No employee found"}
 
+        # Ciclo ABIERTO como prioridad, último CERRADO como fallback (cacheado)
+        last_cycle = self._resolve_cycle()
+
+        cycle_info = None
+        my_score = None
+        top_records = []
+
+        if last_cycle:
+            top = self._top_performers_payload(last_cycle, 5, DASHBOARD_TOP_FIELDS)
+            cycle_info = top["cycle"]
+            my_score = self._my_score(employee, last_cycle)
+            # Top performers del ciclo seleccionado (sea abierto o cerrado)
+            top_records = top["records"]
+
+        return {
+            "status": "ok",
+            "employee": self._dashboard_employee_vals(employee),
+            "last_cycle": cycle_info,
+            "my_score": my_score,
+            "top_performers": top_records,
+        }
+
+    @http.route(
+        "/med_goals/api/portal",
+        type="json",
+        auth="user",
+        methods=["POST"],
+        csrf=False,
+    )
+    def get_portal(self, **payload):
+        """
+        Dashboard + mis metas + top performers en un solo viaje: empleado y
+        ciclo se resuelven una vez y cada bloque cuesta un número fijo de
+        consultas (top performers y ciclo salen de la caché de payloads).
+        Las metas son las del ciclo resuelto, o todas con "all_goals".
+        """
+        _ensure_group("med_goals.group_med_goals_user")
+
+        employee = self._get_current_employee()
+        if not employee:
+            return {"status": "error", "message": "No employee found"}
+
+        cycle = self._resolve_cycle(payload.get("cycle_id"))
+        result = {
+            "status": "ok",
+            "employee_id": employee.id,
+            "employee": self._dashboard_employee_vals(employee),
+            "last_cycle": None,
+            "my_score": None,
+            "my_goals": [],
+            "top_performers": [],
+        }
+        if payload.get("all_goals"):
+            result["my_goals"] = self._my_goals(employee, state=payload.get("state"))
+        if cycle:
+            top = self._top_performers_payload(cycle, payload.get("top_limit", 5), DASHBOARD_TOP_FIELDS)
+            result["last_cycle"] = top["cycle"]
+            result["top_performers"] = top["records"]
+            result["my_score"] = self._my_score(employee, cycle)
+            if not payload.get("all_goals"):
+                result["my_goals"] = self._my_goals(employee, cycle.id, payload.get("state"))
+        return result
+
+    def _dashboard_employee_vals(self, employee):
         emp_vals = employee.read(
             [
                 "name",
@@ -531,74 +1023,49 @@ class MedGoalsApi(http.Controller):
                 "med_specialty_id": "med_specialty",
             },
         )
+        return emp_vals
 
-        Cycle = request.env["med.evaluation.cycle"].sudo()
-        Score = request.env["med.employee.score"].sudo()
-
-        # CAMBIO PRINCIPAL: Buscar 'open' en lugar de 'closed'
-        last_cycle = Cycle.search(
-            [
-                ("state", "=", "open"), 
-                ("company_id", "in", request.env.user.company_ids.ids),
-            ],
+    def _my_score(self, employee, cycle):
+        my_scores = request.env["med.leaderboard"].sudo().search_read(
+            [("employee_id", "=", employee.id), ("cycle_id", "=", cycle.id)],
+            MY_SCORE_FIELDS,
             limit=1,
-            order="date_start desc",
         )
-        
-        # Fallback si no hay abierto (opcional, si quieres que siempre muestre algo)
-        if not last_cycle:
-             last_cycle = Cycle.search(
-                [
-                    ("state", "=", "closed"),
-                    ("company_id", "in", request.env.user.company_ids.ids),
-                ],
-                limit=1,
-                order="date_end desc",
-            )
-
-        cycle_info = None
-        my_score = None
-        top_records = []
-
-        if last_cycle:
-            cycle_info = last_cycle.read(
-                ["id", "name", "date_start", "date_end", "state"]
-            )[0]
+        return my_scores[0] if my_scores else None
 
-            my_score_rec = Score.search(
-                [("employee_id", "=", employee.id), ("cycle_id", "=", last_cycle.id)],
-                limit=1,
-            )
-            if my_score_rec:
-                my_score = my_score_rec.read(
-                    [
-                        "score_total",
-                        "score_goals",
-                        "score_productivity",
-                        "score_quality",
-                        "score_economic",
-                        "rank_global",
-                        "rank_area",
-                        "rank_specialty",
-                        "is_top_performer",
-                    ]
-                )[0]
-
-            # Top performers del ciclo seleccionado (sea abierto o cerrado)
-            top_scores = Score.search_read(
-                [("cycle_id", "=", last_cycle.id)],
-                fields=["employee_id", "score_total", "rank_global", "is_top_performer"],
-                order="score_total desc",
-                limit=5,
-            )
-            for rec in top_scores:
-                self.serializer.map_many2one(rec, {"employee_id": "employee"})
-                top_records.append(rec)
-
-        return {
-            "status": "ok",
-            "employee": emp_vals,
-            "last_cycle": cycle_info,
-            "my_score": my_score,
-            "top_performers": top_records,
-        }
+    # =========================================================
+    # 10) MÉTRICAS (PROMETHEUS)
+    # =========================================================
+    @http.route(
+        "/med_goals/api/_metrics",
+        type="http",
+        auth="public",
+        methods=["GET"],
+        csrf=False,
+    )
+    def get_metrics(self, **kwargs):
+        """
+        Resúmenes por ruta (tiempo, consultas SQL, registros ORM, bytes) y
+        contadores de la caché de payloads, en formato de texto Prometheus.
+        Acceso con "Authorization: Bearer <token>" (parámetro
+        med_goals.metrics_token) o sesión de manager. Las cifras son del
+        proceso worker que atiende la petición.
+        """
+        token = request.env["ir.config_parameter"].sudo().get_param("med_goals.metrics_token")
+        authorization = request.httprequest.headers.get("Authorization", "")
+        scheme, _sep, given = authorization.partition(" ")
+        allowed = (
+            # Bytes: compare_digest rechaza str con caracteres no ASCII.
+            bool(token)
+            and scheme.lower() == "bearer"
+            and hmac.compare_digest(given.strip().encode(), token.encode())
+        ) or (
+            not request.env.user._is_public()
+            and request.env.user.has_group("med_goals.group_med_goals_manager")
+        )
+        if not allowed:
+            return self._json_response({"status": "error", "message": "Forbidden"}, status=403)
+        return http.Response(
+            metrics.registry.render_prometheus() + metrics.render_cache_stats(payload_cache.stats()),
+            headers={"Content-Type": METRICS_CONTENT_TYPE, "Cache-Control": "no-store"},
+        )
@@ -3,7 +3,13 @@ from . import med_specialty
 from . import med_goal_definition
 from . import med_goal_assignment
 from . import med_performance_log
+from . import med_performance_log_daily
+from . import med_performance_log_queue
 from . import med_evaluation_cycle
 from . import med_employee_score
+from . import med_score_dirty
 from . import med_scoring_config
 from . import hr_employee_inherit
+from . import ir_http
+from . import base
+from . import med_leaderboard
@@ -0,0 +1,14 @@
+from odoo import models
+from odoo.http import request
+
+
+class Base(models.AbstractModel):
+    _inherit = "base"
+
+    def _fetch_query(self, query, fields):
+        fetched = super()._fetch_query(query, fields)
+        # Records read from the database during a MED-GOALS API request (see ir.http).
+        stats = getattr(request, "med_goals_stats", None) if request else None
+        if stats is not None:
+            stats["orm_records"] += len(fetched)
+        return fetched
@@ -1,11 +1,26 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.tools.sql import table_exists
+
+# Employee fields med.leaderboard partitions its ranks on.
+LEADERBOARD_RANK_FIELDS = {"med_area_id", "med_specialty_id"}
+
+# Copy of the latest med.employee.score, kept by _refresh_last_score.
+LAST_SCORE_FIELDS = [
+    "last_score_id",
+    "last_score",
+    "last_evaluation_date",
+    "is_top_performer",
+    "rank_area",
+    "rank_specialty",
+]
+
 
 class HREmployee(models.Model):
     _inherit = "hr.employee"
 
-    med_area_id = fields.Many2one("med.area", string="MED Area")
-    med_specialty_id = fields.Many2one("med.specialty", string="MED Specialty")
+    med_area_id = fields.Many2one("med.area", string="MED Area", index=True)
+    med_specialty_id = fields.Many2one("med.specialty", string="MED Specialty", index=True)
 
     goal_assignment_ids = fields.One2many(
         "med.goal.assignment",
@@ -37,66 +52,131 @@ class HREmployee(models.Model):
     )
 
     def _compute_current_wage(self):
+        # One contract search for the whole recordset (list views, exports, API).
+        contracts = self._get_active_contracts(("open",))
         for employee in self:
-            if 'hr.contract' not in self.env:
-                employee.current_wage = 0.0
-                continue
-
-            contract = self.env['hr.contract'].search([
-                ('employee_id', '=', employee.id),
-                ('state', '=', 'open')
-            ], limit=1)
-            
+            contract = contracts.get(employee.id)
             employee.current_wage = contract.wage if contract else 0.0
 
+    def _get_active_contracts(self, states=("open", "draft")):
+        """
+        Latest contract (by start date) in ``states`` of every employee of
+        ``self``, as ``{employee_id: hr.contract}``, fetched with one search.
+        """
+        if "hr.contract" not in self.env or not self.ids:
+            return {}
+        contracts = self.env["hr.contract"].search(
+            [
+                ("employee_id", "in", self.ids),
+                ("state", "in", list(states)),
+            ],
+            order="date_start desc, id desc",
+        )
+        by_employee = {}
+        for contract in contracts:
+            by_employee.setdefault(contract.employee_id.id, contract)
+        return by_employee
+
     # -------------------------------------------------------------------------
 
+    # Latest score pointer: maintained in bulk by _refresh_last_score (see
+    # med.employee.score), not recomputed from the history on every write.
+    last_score_id = fields.Many2one(
+        "med.employee.score",
+        string="Last Score",
+        readonly=True,
+        ondelete="set null",
+    )
     last_score = fields.Float(
         string="Last Total Score",
         digits=(3, 2),
-        compute="_compute_last_score_info",
-        store=True,
+        readonly=True,
     )
     last_evaluation_date = fields.Datetime(
         string="Last Evaluation Date",
-        compute="_compute_last_score_info",
-        store=True,
+        readonly=True,
     )
     is_top_performer = fields.Boolean(
         string="Top Performer",
-        compute="_compute_last_score_info",
-        store=True,
+        readonly=True,
     )
     rank_area = fields.Integer(
         string="Rank in Area",
-        compute="_compute_last_score_info",
-        store=True,
+        readonly=True,
     )
     rank_specialty = fields.Integer(
         string="Rank in Specialty",
-        compute="_compute_last_score_info",
-        store=True,
+        readonly=True,
     )
 
-    @api.depends("employee_score_ids.score_total", "employee_score_ids.create_date")
-    def _compute_last_score_info(self):
-        for employee in self:
-            last = employee.employee_score_ids.sorted(
-                key=lambda s: s.create_date or s.id, reverse=True
-            )[:1]
-            if last:
-                last = last[0]
-                employee.last_score = last.score_total
-                employee.last_evaluation_date = last.create_date
-                employee.is_top_performer = last.is_top_performer
-                employee.rank_area = last.rank_area
-                employee.rank_specialty = last.rank_specialty
-            else:
-                employee.last_score = 0.0
-                employee.last_evaluation_date = False
-                employee.is_top_performer = False
-                employee.rank_area = 0
-                employee.rank_specialty = 0
+    def init(self):
+        # Upgrade from the computed fields: point employees to their latest score.
+        if not table_exists(self._cr, "med_employee_score"):
+            return
+        self._cr.execute(
+            """
+            SELECT DISTINCT s.employee_id
+              FROM med_employee_score s
+              JOIN hr_employee e ON e.id = s.employee_id
+             WHERE e.last_score_id IS NULL
+            """
+        )
+        employee_ids = [row[0] for row in self._cr.fetchall()]
+        if employee_ids:
+            self.browse(employee_ids)._refresh_last_score()
+
+    def _refresh_last_score(self):
+        """
+        Point every employee of ``self`` to their most recent score and copy
+        its values, in one UPDATE (one index lookup per employee on
+        med_employee_score (employee_id, create_date DESC)). Employees
+        without scores are reset; unchanged rows are not written. Changed
+        rows get a new write_date, which the public list's ETag and
+        Last-Modified are derived from.
+        """
+        if not self.ids:
+            return
+        self.env["med.employee.score"].flush_model()
+        self.flush_model(LAST_SCORE_FIELDS)
+        self.env.cr.execute(
+            """
+            UPDATE hr_employee e
+               SET last_score_id = l.id,
+                   last_score = COALESCE(ROUND(l.score_total::numeric, 2), 0),
+                   last_evaluation_date = l.create_date,
+                   is_top_performer = COALESCE(l.is_top_performer, false),
+                   rank_area = COALESCE(l.rank_area, 0),
+                   rank_specialty = COALESCE(l.rank_specialty, 0),
+                   write_date = (now() at time zone 'UTC')
+              FROM unnest(%s::int[]) AS t(employee_id)
+         LEFT JOIN LATERAL (
+                       SELECT s.id, s.score_total, s.create_date,
+                              s.is_top_performer, s.rank_area, s.rank_specialty
+                         FROM med_employee_score s
+                        WHERE s.employee_id = t.employee_id
+                     ORDER BY s.create_date DESC NULLS LAST, s.id DESC
+                        LIMIT 1
+                   ) l ON true
+             WHERE e.id = t.employee_id
+               AND (e.last_score_id IS DISTINCT FROM l.id
+                    OR e.last_score IS DISTINCT FROM COALESCE(ROUND(l.score_total::numeric, 2), 0)
+                    OR e.last_evaluation_date IS DISTINCT FROM l.create_date
+                    OR e.is_top_performer IS DISTINCT FROM COALESCE(l.is_top_performer, false)
+                    OR e.rank_area IS DISTINCT FROM COALESCE(l.rank_area, 0)
+                    OR e.rank_specialty IS DISTINCT FROM COALESCE(l.rank_specialty, 0))
+            """,
+            [self.ids],
+        )
+        self.invalidate_model(LAST_SCORE_FIELDS + ["write_date"])
+
+    def write(self, vals):
+        res = super().write(vals)
+        Leaderboard = self.env["med.leaderboard"].sudo()
+        if "name" in vals:
+            Leaderboard._rename_employees(self.ids)
+        if LEADERBOARD_RANK_FIELDS.intersection(vals):
+            Leaderboard._refresh_for_employees(self.ids)
+        return res
 
     # TUS VALIDACIONES ORIGINALES
     @api.constrains("private_email")
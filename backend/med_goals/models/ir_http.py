@@ -0,0 +1,123 @@
+import gzip
+import logging
+import threading
+import time
+
+from werkzeug.http import parse_accept_header
+
+from odoo import models
+from odoo.http import request
+from odoo.tools import str2bool
+
+from ..services import metrics
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+_logger = logging.getLogger(__name__)
+
+API_PREFIX = "/med_goals/api/"
+
+# Defaults of the ir.config_parameter knobs (med_goals.compression_*).
+COMPRESSION_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+PAYLOAD_BUDGET_BYTES = 1024 * 1024
+
+
+class IrHttp(models.AbstractModel):
+    _inherit = "ir.http"
+
+    @classmethod
+    def _pre_dispatch(cls, rule, args):
+        super()._pre_dispatch(rule, args)
+        if request.httprequest.path.startswith(API_PREFIX):
+            # Route template, not the path: bounded metric labels.
+            request.med_goals_route = rule.rule
+            # Odoo counts the queries of the request thread on every cursor;
+            # the difference at _post_dispatch is what the route cost.
+            thread = threading.current_thread()
+            request.med_goals_stats = {
+                "start": time.perf_counter(),
+                "query_count": getattr(thread, "query_count", 0),
+                "query_time": getattr(thread, "query_time", 0.0),
+                "orm_records": 0,
+            }
+
+    @classmethod
+    def _post_dispatch(cls, response):
+        super()._post_dispatch(response)
+        if request.httprequest.path.startswith(API_PREFIX):
+            cls._med_goals_finalize_response(response)
+            cls._med_goals_record_request(response)
+
+    @classmethod
+    def _med_goals_record_request(cls, response):
+        """
+        Per-route wall time, SQL queries/time, ORM records fetched and
+        response bytes: sent back as Server-Timing and added to the rolling
+        summaries served by /med_goals/api/_metrics. For streamed responses
+        the figures stop when the body starts streaming.
+        """
+        stats = getattr(request, "med_goals_stats", None)
+        if stats is None:
+            return
+        thread = threading.current_thread()
+        values = {
+            "duration_seconds": time.perf_counter() - stats["start"],
+            "sql_queries": getattr(thread, "query_count", 0) - stats["query_count"],
+            "sql_seconds": getattr(thread, "query_time", 0.0) - stats["query_time"],
+            "orm_records": stats["orm_records"],
+            "response_bytes": response.content_length or 0,
+        }
+        response.headers["Server-Timing"] = (
+            f'app;dur={values["duration_seconds"] * 1000:.1f}, '
+            f'sql;dur={values["sql_seconds"] * 1000:.1f};desc="{values["sql_queries"]} queries", '
+            f'orm;desc="{values["orm_records"]} records"'
+        )
+        metrics.registry.observe_request(request.med_goals_route, values)
+
+    @classmethod
+    def _med_goals_finalize_response(cls, response):
+        """
+        Negotiated gzip/brotli compression of API responses above the size
+        threshold, and per-route size metrics. type="http" routes are always
+        eligible; JSON-RPC routes only with med_goals.compress_jsonrpc.
+        Streamed bodies (exports) are left untouched.
+        """
+        if response.direct_passthrough or response.is_streamed or response.status_code != 200:
+            return
+        body = response.get_data()
+        ICP = request.env["ir.config_parameter"].sudo()
+        route = getattr(request, "med_goals_route", request.httprequest.path)
+
+        budget = int(ICP.get_param("med_goals.payload_budget_bytes", PAYLOAD_BUDGET_BYTES))
+        over_budget = bool(budget) and len(body) > budget
+        if over_budget:
+            _logger.warning("Payload budget exceeded on %s: %s bytes (budget %s)", route, len(body), budget)
+
+        encoded = None
+        if not response.headers.get("Content-Encoding") and (
+            request.dispatcher.routing_type == "http"
+            or str2bool(ICP.get_param("med_goals.compress_jsonrpc", "False"))
+        ) and len(body) >= int(ICP.get_param("med_goals.compression_min_bytes", COMPRESSION_MIN_BYTES)):
+            accepted = parse_accept_header(request.httprequest.headers.get("Accept-Encoding"))
+            if brotli is not None and accepted["br"]:
+                quality = int(ICP.get_param("med_goals.brotli_quality", BROTLI_QUALITY))
+                encoded = ("br", brotli.compress(body, quality=quality))
+            elif accepted["gzip"]:
+                level = int(ICP.get_param("med_goals.gzip_level", GZIP_LEVEL))
+                encoded = ("gzip", gzip.compress(body, compresslevel=level))
+
+        if encoded and len(encoded[1]) < len(body):
+            encoding, data = encoded
+            response.set_data(data)
+            response.headers["Content-Encoding"] = encoding
+            response.vary.add("Accept-Encoding")
+            # The representation changed: a strong validator would now lie.
+            etag, weak = response.get_etag()
+            if etag and not weak:
+                response.set_etag(etag, weak=True)
+        metrics.registry.record_response_size(route, len(body), response.content_length or 0, over_budget)
@@ -1,5 +1,21 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.tools.sql import create_index, drop_index
+
+from ..services import cache
+
+# Employees whose hr.employee "last score" pointer must be refreshed.
+_LAST_SCORE_PENDING = "med_goals.last_score.pending"
+# Score fields copied onto hr.employee by the pointer refresh.
+LAST_SCORE_SOURCE_FIELDS = {"employee_id", "score_total", "is_top_performer", "rank_area", "rank_specialty"}
+# Cycles whose ranks and leaderboard must be rebuilt after a manual edit.
+_RANKING_PENDING = "med_goals.ranking.pending"
+# Score fields the ranks and the leaderboard are derived from.
+RANKING_SOURCE_FIELDS = {
+    "employee_id", "cycle_id", "score_total",
+    "score_goals", "score_productivity", "score_quality", "score_economic",
+}
+
 
 class MedEmployeeScore(models.Model):
     _name = "med.employee.score"
@@ -33,6 +49,26 @@ class MedEmployeeScore(models.Model):
 
     is_top_performer = fields.Boolean(string="Top Performer")
 
+    def init(self):
+        # Scoreboard / top performers: range scan per cycle already sorted.
+        create_index(
+            self._cr, "med_employee_score_cycle_total_idx", self._table,
+            ["cycle_id", "score_total DESC", "id"],
+        )
+        # Score history per employee, newest first.
+        create_index(
+            self._cr, "med_employee_score_employee_create_idx", self._table,
+            ["employee_id", "create_date DESC"],
+        )
+        # Company-wide activity feed, keyset on (create_date, id).
+        create_index(
+            self._cr, "med_employee_score_company_create_idx", self._table,
+            ["company_id", "create_date DESC", "id DESC"],
+        )
+        # Covered by the leading columns of the composites above.
+        drop_index(self._cr, "med_employee_score_employee_id_index", self._table)
+        drop_index(self._cr, "med_employee_score_cycle_id_index", self._table)
+
     # BACK-END VALIDATION: HR PERFORMANCE DATA
     @api.constrains("score_total","score_goals","score_productivity","score_quality","score_economic")
     def _check_scores_range(self):
@@ -50,3 +86,82 @@ class MedEmployeeScore(models.Model):
                     raise ValidationError(
                         _("%s must be between 0 and 10.") % label
                     )
+
+    # API PAYLOAD CACHE INVALIDATION + LATEST SCORE POINTER
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        cache.invalidate(self.env)
+        records._schedule_last_score_refresh()
+        records._schedule_ranking()
+        return records
+
+    def write(self, vals):
+        if "employee_id" in vals:
+            self._schedule_last_score_refresh()
+        if "cycle_id" in vals:
+            self._schedule_ranking()
+        res = super().write(vals)
+        cache.invalidate(self.env)
+        if LAST_SCORE_SOURCE_FIELDS.intersection(vals):
+            self._schedule_last_score_refresh()
+        if RANKING_SOURCE_FIELDS.intersection(vals):
+            self._schedule_ranking()
+        return res
+
+    def unlink(self):
+        cache.invalidate(self.env)
+        self._schedule_last_score_refresh()
+        self._schedule_ranking()
+        return super().unlink()
+
+    def _schedule_last_score_refresh(self, employee_ids=None):
+        """
+        Queue employees for one bulk refresh of their latest-score pointer,
+        run by the cycle's ranking pass or, at the latest, before commit,
+        instead of re-deriving it from the whole history on every write.
+        """
+        employee_ids = set(self.employee_id.ids if employee_ids is None else employee_ids)
+        if not employee_ids:
+            return
+        precommit = self.env.cr.precommit
+        pending = precommit.data.get(_LAST_SCORE_PENDING)
+        if pending is None:
+            pending = precommit.data[_LAST_SCORE_PENDING] = set()
+            precommit.add(self.sudo()._flush_last_score_refresh)
+        pending.update(employee_ids)
+
+    @api.model
+    def _flush_last_score_refresh(self):
+        pending = self.env.cr.precommit.data.pop(_LAST_SCORE_PENDING, None)
+        if pending:
+            self.env["hr.employee"].sudo().browse(sorted(pending))._refresh_last_score()
+
+    def _schedule_ranking(self, cycle_ids=None):
+        """
+        Queue cycles for one re-rank and leaderboard rebuild before commit,
+        so edits made outside the scoring engine never leave stale boards.
+        The engine ranks its cycles itself and drops them from the queue.
+        """
+        cycle_ids = set(self.cycle_id.ids if cycle_ids is None else cycle_ids)
+        if not cycle_ids:
+            return
+        precommit = self.env.cr.precommit
+        pending = precommit.data.get(_RANKING_PENDING)
+        if pending is None:
+            pending = precommit.data[_RANKING_PENDING] = set()
+            precommit.add(self.sudo()._flush_ranking)
+        pending.update(cycle_ids)
+
+    @api.model
+    def _discard_ranking(self, cycle_ids):
+        pending = self.env.cr.precommit.data.get(_RANKING_PENDING)
+        if pending:
+            pending.difference_update(cycle_ids)
+
+    @api.model
+    def _flush_ranking(self):
+        pending = self.env.cr.precommit.data.pop(_RANKING_PENDING, None)
+        if pending:
+            for cycle in self.env["med.evaluation.cycle"].sudo().browse(sorted(pending)).exists():
+                cycle._compute_rankings()
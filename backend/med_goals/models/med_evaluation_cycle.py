@@ -1,10 +1,33 @@
 import logging # <--- IMPORTANTE: AGREGAR ESTO ARRIBA
+import os
+import threading
+import time
+
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from ..services import cache
+from ..services.parallel_scoring import score_shards_in_parallel
 from ..services.score_engine import ScoreEngineFactory
 
 _logger = logging.getLogger(__name__) # <--- IMPORTANTE
 
+# Number of global positions flagged as top performers on each cycle.
+TOP_PERFORMERS = 3
+
+# Live scoring cron defaults, overridable through ir.config_parameter.
+LIVE_SCORING_TIME_BUDGET = 120.0    # seconds per cron run
+LIVE_SCORING_RECORD_BUDGET = 20000  # employees rescored per cron run
+LIVE_SCORING_CHUNK_SIZE = 500       # employees per committed transaction
+
+# Cycle fields exposed in cached API payloads (cycle resolution, cycle info).
+CACHED_FIELDS = {"name", "company_id", "date_start", "date_end", "state"}
+
+# Score fields written by the engine (compared before rewriting a row).
+SCORE_COMPONENT_FIELDS = {"score_goals", "score_productivity", "score_quality", "score_economic", "score_total"}
+
+# Employees per worker task in the parallel batch close.
+PARALLEL_CLOSE_SHARD_SIZE = 2000
+
 class MedEvaluationCycle(models.Model):
     _name = "med.evaluation.cycle"
     _description = "Evaluation Cycle (Period)"
@@ -47,6 +70,19 @@ class MedEvaluationCycle(models.Model):
         string="Employee Scores",
     )
 
+    # Live scoring progress (see _cron_live_scoring)
+    live_scoring_cursor = fields.Integer(
+        string="Live Scoring Cursor",
+        readonly=True,
+        copy=False,
+        help="Last employee id refreshed by the live scoring job in the current sweep.",
+    )
+    live_scored_at = fields.Datetime(
+        string="Last Live Scoring",
+        readonly=True,
+        copy=False,
+    )
+
     _sql_constraints = [
         (
             "name_company_uniq",
@@ -64,6 +100,22 @@ class MedEvaluationCycle(models.Model):
                     _("End date must be greater than or equal to start date.")
                 )
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        cache.invalidate(self.env)
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if CACHED_FIELDS.intersection(vals):
+            cache.invalidate(self.env)
+        return res
+
+    def unlink(self):
+        cache.invalidate(self.env)
+        return super().unlink()
+
     def action_open(self):
         for rec in self:
             if rec.state != "draft":
@@ -77,79 +129,383 @@ class MedEvaluationCycle(models.Model):
             rec._compute_scores()
             rec.state = "closed"
 
+    def action_recompute_scores(self):
+        self._recompute_dirty_scores()
+
+    def action_generate_assignments(self, employees=None, goals=None):
+        """
+        Seed the cycle with one assignment per (employee, matching goal) not
+        assigned yet. A goal matches an employee when its area and specialty
+        are empty or equal to the employee's. Defaults: the active employees
+        and goal definitions of the cycle's company; targets come from
+        ``default_target_value`` (goals without a positive default are skipped).
+        Everything is read up front and created with a single create() call.
+        """
+        Assignment = self.env["med.goal.assignment"]
+        for cycle in self.filtered(lambda c: c.state in ("draft", "open")):
+            # None means "the whole company"; an empty recordset seeds nothing.
+            cycle_employees = employees if employees is not None else self.env["hr.employee"].search(
+                [("company_id", "=", cycle.company_id.id)]
+            )
+            cycle_goals = goals if goals is not None else self.env["med.goal.definition"].search(
+                [("company_id", "=", cycle.company_id.id)]
+            )
+            employee_rows = cycle_employees.read(["name", "med_area_id", "med_specialty_id"], load=None)
+            goal_rows = cycle_goals.read(["name", "area_id", "specialty_id", "default_target_value"], load=None)
+
+            goals_by_scope = {}
+            skipped = 0
+            for goal in goal_rows:
+                if (goal["default_target_value"] or 0.0) <= 0:
+                    skipped += 1
+                    continue
+                goals_by_scope.setdefault((goal["area_id"], goal["specialty_id"]), []).append(goal)
+
+            Assignment.flush_model(["employee_id", "goal_id", "evaluation_cycle_id"])
+            self.env.cr.execute(
+                "SELECT employee_id, goal_id FROM med_goal_assignment WHERE evaluation_cycle_id = %s",
+                [cycle.id],
+            )
+            existing = set(self.env.cr.fetchall())
+
+            vals_list = []
+            for employee in employee_rows:
+                area, specialty = employee["med_area_id"] or False, employee["med_specialty_id"] or False
+                scopes = {(False, False), (area, False), (False, specialty), (area, specialty)}
+                for scope in scopes:
+                    for goal in goals_by_scope.get(scope, ()):
+                        if (employee["id"], goal["id"]) in existing:
+                            continue
+                        vals_list.append({
+                            "name": " - ".join(p for p in (employee["name"], goal["name"], cycle.name) if p),
+                            "company_id": cycle.company_id.id,
+                            "employee_id": employee["id"],
+                            "goal_id": goal["id"],
+                            "evaluation_cycle_id": cycle.id,
+                            "target_value": goal["default_target_value"],
+                        })
+
+            Assignment.create(vals_list)
+            _logger.info(
+                "Generated %s assignments for cycle %s (%s goals without default target skipped)",
+                len(vals_list), cycle.name, skipped,
+            )
+
+    def action_close_batch(self):
+        """
+        Close several cycles at once, scoring them on a process pool (see
+        services/parallel_scoring.py). Only the scoring is parallel: every
+        selected cycle is then stored, ranked and closed in the caller's
+        single transaction, so a failure leaves all of them open and the
+        action can simply be retried (closed cycles are skipped).
+        """
+        cycles = self.filtered(lambda c: c.state != "closed")
+        if not cycles:
+            return
+        ICP = self.env["ir.config_parameter"].sudo()
+        workers = int(ICP.get_param("med_goals.parallel_close_workers", 0) or 0) or os.cpu_count() or 1
+        shard_size = int(ICP.get_param("med_goals.parallel_close_shard_size", PARALLEL_CLOSE_SHARD_SIZE))
+
+        shards = [
+            (cycle.id, employee_ids)
+            for cycle in cycles
+            for employee_ids in cycle._employee_shards(shard_size)
+        ]
+        if workers <= 1 or len(shards) <= 1:
+            cycles.action_close()
+            return
+
+        started = time.monotonic()
+        breakdowns_by_cycle = score_shards_in_parallel(self.env, shards, workers)
+        for cycle in cycles:
+            cycle._store_scores(breakdowns_by_cycle.get(cycle.id, {}))
+            cycle.state = "closed"
+        _logger.info(
+            "Closed %s cycles (%s shards) with %s workers in %.2fs",
+            len(cycles), len(shards), workers, time.monotonic() - started,
+        )
+
+    def _employee_shards(self, shard_size):
+        """Employee ids with active assignments in this cycle, split in shards."""
+        self.ensure_one()
+        self.env["med.goal.assignment"].flush_model(["employee_id", "evaluation_cycle_id", "state"])
+        self.env.cr.execute(
+            """
+            SELECT DISTINCT employee_id
+              FROM med_goal_assignment
+             WHERE evaluation_cycle_id = %s AND state != 'cancelled'
+          ORDER BY employee_id
+            """,
+            [self.id],
+        )
+        employee_ids = [row[0] for row in self.env.cr.fetchall()]
+        return [
+            employee_ids[i:i + shard_size] for i in range(0, len(employee_ids), shard_size)
+        ]
+
     def _compute_scores(self):
         self.ensure_one()
-        Score = self.env["med.employee.score"]
-        Score.search([("cycle_id", "=", self.id)]).unlink()
+        self._store_scores(self._compute_breakdowns())
 
+    def _compute_breakdowns(self, employee_ids=None):
+        """
+        Score breakdowns ``{employee_id: components}`` for the cycle's active
+        assignments, for every employee or only ``employee_ids``.
+        """
+        self.ensure_one()
         engine = ScoreEngineFactory.from_cycle(self.env, self, logger=_logger)
 
-        assignments = self.assignment_ids.filtered(lambda a: a.state != "cancelled")
-        employees = assignments.mapped("employee_id")
+        domain = [("evaluation_cycle_id", "=", self.id), ("state", "!=", "cancelled")]
+        if employee_ids is not None:
+            domain.append(("employee_id", "in", list(employee_ids)))
+        assignments = self.env["med.goal.assignment"].search(domain)
 
         _logger.info("=== INICIANDO CÁLCULO CICLO: %s (Días: %s) ===", self.name, engine.cycle_days)
 
-        for employee in employees:
-            emp_assignments = assignments.filtered(lambda a: a.employee_id == employee)
-            breakdown = engine.compute_components(employee, emp_assignments)
+        # Batch mode: assignments, goals, log totals and contracts are
+        # prefetched once for the whole cycle instead of per employee.
+        return engine.compute_batch(assignments)
 
-            Score.create({
-                "employee_id": employee.id,
-                "cycle_id": self.id,
-                "score_goals": breakdown.get("goals", 0.0),
-                "score_productivity": breakdown.get("productivity", 0.0),
-                "score_quality": breakdown.get("quality", 0.0),
-                "score_economic": breakdown.get("economic", 0.0),
-                "score_total": breakdown.get("total", 0.0),
-            })
+    def _store_scores(self, breakdowns):
+        """Replace every score row of the cycle with ``breakdowns`` and rank them."""
+        self.ensure_one()
+        Score = self.env["med.employee.score"]
+        Score.search([("cycle_id", "=", self.id)]).unlink()
+        # A full rebuild supersedes any pending incremental work.
+        self.env["med.score.dirty"]._consume(self)
+
+        Score.create([
+            self._prepare_score_vals(employee_id, breakdown)
+            for employee_id, breakdown in breakdowns.items()
+        ])
 
         self._compute_rankings()
 
+    def _prepare_score_vals(self, employee_id, breakdown):
+        return {
+            "employee_id": employee_id,
+            "cycle_id": self.id,
+            "score_goals": breakdown.get("goals", 0.0),
+            "score_productivity": breakdown.get("productivity", 0.0),
+            "score_quality": breakdown.get("quality", 0.0),
+            "score_economic": breakdown.get("economic", 0.0),
+            "score_total": breakdown.get("total", 0.0),
+        }
+
+    def _recompute_dirty_scores(self):
+        """
+        Incremental path for open cycles: rescore only the employees flagged
+        in med.score.dirty, in place, then refresh the ranks.
+        """
+        for rec in self.filtered(lambda c: c.state == "open"):
+            employee_ids = self.env["med.score.dirty"]._consume(rec)
+            if not employee_ids:
+                continue
+            _logger.info("Recomputing %s dirty scores for cycle %s", len(employee_ids), rec.name)
+            changed_ids = rec._rescore_employees(employee_ids)
+            if changed_ids:
+                rec._compute_rankings(changed_ids)
+
+    def _rescore_employees(self, employee_ids):
+        """
+        Upsert the score rows of ``employee_ids`` with the batch engine.
+        Employees left without active assignments lose their score row.
+        Rows whose components did not move are left alone, so a sweep over
+        an idle cycle touches neither write_date nor the payload cache.
+        Returns the ids of the rows created, written or deleted (empty if
+        nothing moved), for the ranking pass to patch the leaderboard with.
+        """
+        self.ensure_one()
+        Score = self.env["med.employee.score"]
+        breakdowns = self._compute_breakdowns(employee_ids)
+
+        existing = Score.search([
+            ("cycle_id", "=", self.id),
+            ("employee_id", "in", list(employee_ids)),
+        ])
+        score_by_employee = {}
+        for score in existing:
+            score_by_employee.setdefault(score.employee_id.id, score)
+
+        to_create = []
+        kept_ids = set()
+        changed_ids = set()
+        for employee_id, breakdown in breakdowns.items():
+            vals = self._prepare_score_vals(employee_id, breakdown)
+            score = score_by_employee.get(employee_id)
+            if score:
+                diff = {
+                    name: value for name, value in vals.items()
+                    if name in SCORE_COMPONENT_FIELDS and score[name] != value
+                }
+                if diff:
+                    score.write(diff)
+                    changed_ids.add(score.id)
+                kept_ids.add(score.id)
+            else:
+                to_create.append(vals)
+        stale = existing - Score.browse(kept_ids)
+        changed_ids.update(stale.ids)
+        if to_create:
+            changed_ids.update(Score.create(to_create).ids)
+        if stale:
+            stale.unlink()
+        return changed_ids
+
+    # -------------------------------------------------------------------------
+    # LIVE SCORING (CRON)
+    # -------------------------------------------------------------------------
+    @api.model
+    def _cron_live_scoring(self):
+        """
+        Keep open-cycle scores fresh without one giant transaction: pending
+        dirty employees first, then a resumable sweep over every employee of
+        the cycle, in committed chunks bounded by a time and record budget.
+        """
+        ICP = self.env["ir.config_parameter"].sudo()
+        time_budget = float(ICP.get_param("med_goals.live_scoring_time_budget", LIVE_SCORING_TIME_BUDGET))
+        remaining = int(ICP.get_param("med_goals.live_scoring_record_budget", LIVE_SCORING_RECORD_BUDGET))
+        chunk_size = int(ICP.get_param("med_goals.live_scoring_chunk_size", LIVE_SCORING_CHUNK_SIZE))
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        deadline = time.monotonic() + time_budget
+        Dirty = self.env["med.score.dirty"]
+
+        cycles = self.search([("state", "=", "open")], order="live_scored_at asc nulls first, id")
+        for cycle in cycles:
+            while remaining > 0 and time.monotonic() < deadline:
+                if not cycle._lock_for_live_scoring():
+                    break
+                limit = min(chunk_size, remaining)
+                # Dirty employees go first, sliced like the sweep: a whole
+                # cycle flagged at once (e.g. generated assignments) must not
+                # become one long transaction.
+                employee_ids = Dirty._consume(cycle, limit=limit)
+                sweeping = not employee_ids
+                if sweeping:
+                    employee_ids = cycle._next_live_scoring_chunk(limit)
+                if employee_ids:
+                    changed_ids = cycle._rescore_employees(employee_ids)
+                    if changed_ids:
+                        cycle._compute_rankings(changed_ids)
+                    remaining -= len(employee_ids)
+                done = sweeping and len(employee_ids) < limit
+                if done:
+                    cycle.write({"live_scoring_cursor": 0, "live_scored_at": fields.Datetime.now()})
+                elif sweeping:
+                    cycle.live_scoring_cursor = employee_ids[-1]
+                if auto_commit:
+                    self.env.cr.commit()
+                self.env.invalidate_all()
+                if done:
+                    break
+
+    def _lock_for_live_scoring(self):
+        """Row-lock the cycle for the current chunk; False if it is busy or no longer open."""
+        self.ensure_one()
+        self.env.cr.execute(
+            """
+            SELECT id FROM med_evaluation_cycle
+             WHERE id = %s AND state = 'open'
+               FOR NO KEY UPDATE SKIP LOCKED
+            """,
+            [self.id],
+        )
+        return bool(self.env.cr.fetchone())
+
+    def _next_live_scoring_chunk(self, limit):
+        """Employee ids after the cursor that have active assignments or a score row."""
+        self.ensure_one()
+        self.env["med.goal.assignment"].flush_model(["employee_id", "evaluation_cycle_id", "state"])
+        self.env["med.employee.score"].flush_model(["employee_id", "cycle_id"])
+        self.env.cr.execute(
+            """
+            SELECT employee_id FROM (
+                SELECT employee_id
+                  FROM med_goal_assignment
+                 WHERE evaluation_cycle_id = %(cycle_id)s AND state != 'cancelled'
+                 UNION
+                SELECT employee_id
+                  FROM med_employee_score
+                 WHERE cycle_id = %(cycle_id)s
+            ) AS u
+             WHERE employee_id > %(cursor)s
+          ORDER BY employee_id
+             LIMIT %(limit)s
+            """,
+            {"cycle_id": self.id, "cursor": self.live_scoring_cursor or 0, "limit": limit},
+        )
+        return [row[0] for row in self.env.cr.fetchall()]
+
     # Global rank / AREA / ESPECIALTY
-    def _compute_rankings(self):
-        scores = self.employee_score_ids.sorted(lambda s: -s.score_total)
-
-        # Global rank
-        rank = 0
-        last_score = None
-        for s in scores:
-            if last_score is None or s.score_total < last_score:
-                rank += 1
-                last_score = s.score_total
-            s.rank_global = rank
-
-        # Rank by area
-        scores_by_area = {}
-        for s in scores:
-            area = s.employee_id.med_area_id
-            scores_by_area.setdefault(area, self.env["med.employee.score"])
-            scores_by_area[area] |= s
-
-        for area, area_scores in scores_by_area.items():
-            rank = 0
-            last_score = None
-            for s in area_scores.sorted(lambda r: -r.score_total):
-                if last_score is None or s.score_total < last_score:
-                    rank += 1
-                    last_score = s.score_total
-                s.rank_area = rank
-
-        # Rank by specialty
-        scores_by_spec = {}
-        for s in scores:
-            spec = s.employee_id.med_specialty_id
-            scores_by_spec.setdefault(spec, self.env["med.employee.score"])
-            scores_by_spec[spec] |= s
-
-        for spec, spec_scores in scores_by_spec.items():
-            rank = 0
-            last_score = None
-            for s in spec_scores.sorted(lambda r: -r.score_total):
-                if last_score is None or s.score_total < last_score:
-                    rank += 1
-                    last_score = s.score_total
-                s.rank_specialty = rank
-
-        top_global = scores.sorted(lambda s: s.rank_global)[:3]
-        for s in scores:
-            s.is_top_performer = s in top_global
+    def _compute_rankings(self, changed_score_ids=None):
+        """
+        Dense ranks (global, per area, per specialty) and the global top 3
+        computed by PostgreSQL window functions and applied with a single
+        UPDATE for the whole cycle. Only rows whose ranks actually moved are
+        written, so an incremental recompute touches the affected area and
+        specialty partitions plus whatever shifted in the global ordering.
+
+        Without ``changed_score_ids`` the cycle's leaderboard is rebuilt;
+        with them (incremental rescoring) only those rows and the ones whose
+        ranks moved are patched.
+        """
+        self.ensure_one()
+        Score = self.env["med.employee.score"]
+        Score.flush_model()
+        # Ranked here: a pending re-rank queued by the score writes is moot.
+        Score._discard_ranking(self.ids)
+        self.env["hr.employee"].flush_model(["med_area_id", "med_specialty_id"])
+
+        self.env.cr.execute(
+            """
+            WITH ranked AS (
+                SELECT s.id,
+                       DENSE_RANK() OVER (ORDER BY s.score_total DESC) AS rank_global,
+                       DENSE_RANK() OVER (
+                           PARTITION BY e.med_area_id ORDER BY s.score_total DESC
+                       ) AS rank_area,
+                       DENSE_RANK() OVER (
+                           PARTITION BY e.med_specialty_id ORDER BY s.score_total DESC
+                       ) AS rank_specialty,
+                       ROW_NUMBER() OVER (ORDER BY s.score_total DESC, s.id) AS position
+                  FROM med_employee_score s
+                  JOIN hr_employee e ON e.id = s.employee_id
+                 WHERE s.cycle_id = %(cycle_id)s
+            )
+            UPDATE med_employee_score s
+               SET rank_global = r.rank_global,
+                   rank_area = r.rank_area,
+                   rank_specialty = r.rank_specialty,
+                   is_top_performer = r.position <= %(top)s,
+                   write_uid = %(uid)s,
+                   write_date = (now() at time zone 'UTC')
+              FROM ranked r
+             WHERE s.id = r.id
+               AND (s.rank_global IS DISTINCT FROM r.rank_global
+                    OR s.rank_area IS DISTINCT FROM r.rank_area
+                    OR s.rank_specialty IS DISTINCT FROM r.rank_specialty
+                    OR s.is_top_performer IS DISTINCT FROM (r.position <= %(top)s))
+         RETURNING s.id, s.employee_id
+            """,
+            {"cycle_id": self.id, "top": TOP_PERFORMERS, "uid": self.env.uid},
+        )
+        moved = self.env.cr.fetchall()
+        moved_score_ids = [score_id for score_id, _employee_id in moved]
+        employee_ids = [employee_id for _score_id, employee_id in moved]
+        if employee_ids:
+            cache.invalidate(self.env)
+
+        Score.invalidate_model(
+            ["rank_global", "rank_area", "rank_specialty", "is_top_performer", "write_uid", "write_date"]
+        )
+
+        # The "last score" copy on hr.employee includes the ranks, which were
+        # changed behind the ORM's back: refresh every queued employee once.
+        Score._schedule_last_score_refresh(employee_ids)
+        Score._flush_last_score_refresh()
+
+        Leaderboard = self.env["med.leaderboard"]
+        if changed_score_ids is None:
+            Leaderboard._refresh(self.ids)
+        else:
+            Leaderboard._refresh_rows(set(changed_score_ids).union(moved_score_ids))
@@ -1,5 +1,10 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.tools.sql import create_index, drop_index
+
+
+# Fields whose change can move the owner's score in an open cycle.
+SCORE_FIELDS = {"employee_id", "goal_id", "evaluation_cycle_id", "target_value", "actual_value", "state"}
 
 
 class MedGoalAssignment(models.Model):
@@ -18,6 +23,7 @@ class MedGoalAssignment(models.Model):
         "hr.employee",
         string="Employee",
         required=True,
+        index=True,
     )
     area_id = fields.Many2one(
         related="employee_id.med_area_id",
@@ -60,6 +66,7 @@ class MedGoalAssignment(models.Model):
         ],
         default="draft",
         required=True,
+        index=True,
     )
 
     performance_log_ids = fields.One2many(
@@ -68,6 +75,15 @@ class MedGoalAssignment(models.Model):
         string="Performance Logs",
     )
 
+    def init(self):
+        # Per-employee slices of a cycle (incremental and sharded scoring).
+        create_index(
+            self._cr, "med_goal_assignment_cycle_employee_idx", self._table,
+            ["evaluation_cycle_id", "employee_id"],
+        )
+        # Covered by the leading column of the composite above.
+        drop_index(self._cr, "med_goal_assignment_evaluation_cycle_id_index", self._table)
+
     # BACK-END VALIDATION: target_value > 0, actual_value >= 0
     @api.constrains("target_value", "actual_value")
     def _check_values(self):
@@ -89,26 +105,46 @@ class MedGoalAssignment(models.Model):
             else:
                 rec.completion_rate = 0.0
 
-    @api.model
-    def create(self, vals):
-        if not vals.get("name"):
-            emp_name = ""
-            goal_name = ""
-            cycle_name = ""
-
-            if vals.get("employee_id"):
-                emp = self.env["hr.employee"].browse(vals["employee_id"])
-                emp_name = emp.name or ""
-
-            if vals.get("goal_id"):
-                goal = self.env["med.goal.definition"].browse(vals["goal_id"])
-                goal_name = goal.name or ""
-
-            if vals.get("evaluation_cycle_id"):
-                cycle = self.env["med.evaluation.cycle"].browse(vals["evaluation_cycle_id"])
-                cycle_name = cycle.name or ""
-
-            parts = [p for p in [emp_name, goal_name, cycle_name] if p]
-            vals["name"] = " - ".join(parts) if parts else _("Goal Assignment")
-
-        return super().create(vals)
+    @api.model_create_multi
+    def create(self, vals_list):
+        # Default names resolved with one read per model for the whole batch.
+        missing = [vals for vals in vals_list if not vals.get("name")]
+        if missing:
+            names = {}
+            for fname, model in (
+                ("employee_id", "hr.employee"),
+                ("goal_id", "med.goal.definition"),
+                ("evaluation_cycle_id", "med.evaluation.cycle"),
+            ):
+                ids = {vals[fname] for vals in missing if vals.get(fname)}
+                names[fname] = {rec.id: rec.name or "" for rec in self.env[model].browse(ids)}
+            for vals in missing:
+                parts = [
+                    names[fname].get(vals.get(fname), "")
+                    for fname in ("employee_id", "goal_id", "evaluation_cycle_id")
+                ]
+                parts = [p for p in parts if p]
+                vals["name"] = " - ".join(parts) if parts else _("Goal Assignment")
+
+        records = super().create(vals_list)
+        records._mark_scores_dirty()
+        return records
+
+    def write(self, vals):
+        tracked = SCORE_FIELDS.intersection(vals)
+        if tracked:
+            self._mark_scores_dirty()
+        res = super().write(vals)
+        if tracked & {"employee_id", "evaluation_cycle_id"}:
+            self._mark_scores_dirty()
+        return res
+
+    def unlink(self):
+        self._mark_scores_dirty()
+        return super().unlink()
+
+    def _mark_scores_dirty(self):
+        """Flag the (employee, cycle) pairs of these assignments for recompute."""
+        self.env["med.score.dirty"].sudo()._mark(
+            (rec.employee_id.id, rec.evaluation_cycle_id.id) for rec in self
+        )
@@ -0,0 +1,209 @@
+from odoo import models, fields, api
+from odoo.tools.sql import create_index
+
+from ..services import cache
+from .med_evaluation_cycle import TOP_PERFORMERS
+
+
+class MedLeaderboard(models.Model):
+    """
+    Read-optimized copy of the cycle scoreboards. Rows share the id of their
+    med.employee.score and carry the employee name, area and specialty with
+    ranks computed per partition at refresh time. Renames are patched on
+    every board; an area or specialty move re-ranks the open cycles and the
+    latest closed one (the boards the API serves by default), older boards
+    keep the partition the employee had when they were built.
+    """
+
+    _name = "med.leaderboard"
+    _description = "Cycle Leaderboard (denormalized)"
+    _order = "cycle_id, score_total desc, id"
+    _log_access = False
+
+    score_id = fields.Many2one(
+        "med.employee.score",
+        string="Score",
+        required=True,
+        readonly=True,
+        ondelete="cascade",
+    )
+    cycle_id = fields.Many2one("med.evaluation.cycle", string="Evaluation Cycle", readonly=True)
+    company_id = fields.Many2one("res.company", readonly=True)
+    employee_id = fields.Many2one("hr.employee", string="Employee", readonly=True)
+    employee_name = fields.Char(readonly=True)
+    area_id = fields.Many2one("med.area", string="Area", readonly=True)
+    area_name = fields.Char(readonly=True)
+    specialty_id = fields.Many2one("med.specialty", string="Specialty", readonly=True)
+    specialty_name = fields.Char(readonly=True)
+
+    score_total = fields.Float(string="Total Score (0-10)", readonly=True)
+    score_goals = fields.Float(string="Goals Score (0-10)", readonly=True)
+    score_productivity = fields.Float(string="Productivity (0-10)", readonly=True)
+    score_quality = fields.Float(string="Quality (0-10)", readonly=True)
+    score_economic = fields.Float(string="Economic Contribution (0-10)", readonly=True)
+
+    rank_global = fields.Integer(string="Global Rank", readonly=True)
+    rank_area = fields.Integer(string="Area Rank", readonly=True)
+    rank_specialty = fields.Integer(string="Specialty Rank", readonly=True)
+    is_top_performer = fields.Boolean(string="Top Performer", readonly=True)
+
+    def init(self):
+        # One index range scan per endpoint: whole cycle, per area, per specialty.
+        create_index(
+            self._cr, "med_leaderboard_cycle_total_idx", self._table,
+            ["cycle_id", "score_total DESC", "id"],
+        )
+        create_index(
+            self._cr, "med_leaderboard_cycle_area_idx", self._table,
+            ["cycle_id", "area_id", "score_total DESC", "id"],
+        )
+        create_index(
+            self._cr, "med_leaderboard_cycle_specialty_idx", self._table,
+            ["cycle_id", "specialty_id", "score_total DESC", "id"],
+        )
+        create_index(
+            self._cr, "med_leaderboard_cycle_employee_idx", self._table,
+            ["cycle_id", "employee_id"],
+        )
+        # First install / upgrade: build the boards of every scored cycle.
+        self._cr.execute("SELECT 1 FROM med_leaderboard LIMIT 1")
+        if not self._cr.fetchone():
+            self._cr.execute("SELECT DISTINCT cycle_id FROM med_employee_score")
+            self._refresh([row[0] for row in self._cr.fetchall()])
+
+    @api.model
+    def _refresh(self, cycle_ids):
+        """
+        Rebuild the rows of ``cycle_ids`` from med.employee.score in one
+        DELETE + INSERT ... SELECT. Readers keep seeing the previous board
+        until the transaction commits.
+        """
+        cycle_ids = list(cycle_ids)
+        if not cycle_ids:
+            return
+        self.env["med.employee.score"].flush_model()
+        self.env["hr.employee"].flush_model(["name", "med_area_id", "med_specialty_id"])
+        self.env["med.area"].flush_model(["name"])
+        self.env["med.specialty"].flush_model(["name"])
+
+        self.env.cr.execute("DELETE FROM med_leaderboard WHERE cycle_id = ANY(%s)", [cycle_ids])
+        self.env.cr.execute(
+            """
+            INSERT INTO med_leaderboard (
+                id, score_id, cycle_id, company_id,
+                employee_id, employee_name, area_id, area_name, specialty_id, specialty_name,
+                score_total, score_goals, score_productivity, score_quality, score_economic,
+                rank_global, rank_area, rank_specialty, is_top_performer
+            )
+            SELECT s.id, s.id, s.cycle_id, s.company_id,
+                   s.employee_id, e.name, e.med_area_id, a.name, e.med_specialty_id, sp.name,
+                   s.score_total, s.score_goals, s.score_productivity, s.score_quality, s.score_economic,
+                   DENSE_RANK() OVER (PARTITION BY s.cycle_id ORDER BY s.score_total DESC),
+                   DENSE_RANK() OVER (
+                       PARTITION BY s.cycle_id, e.med_area_id ORDER BY s.score_total DESC
+                   ),
+                   DENSE_RANK() OVER (
+                       PARTITION BY s.cycle_id, e.med_specialty_id ORDER BY s.score_total DESC
+                   ),
+                   ROW_NUMBER() OVER (
+                       PARTITION BY s.cycle_id ORDER BY s.score_total DESC, s.id
+                   ) <= %s
+              FROM med_employee_score s
+              JOIN hr_employee e ON e.id = s.employee_id
+         LEFT JOIN med_area a ON a.id = e.med_area_id
+         LEFT JOIN med_specialty sp ON sp.id = e.med_specialty_id
+             WHERE s.cycle_id = ANY(%s)
+            """,
+            [TOP_PERFORMERS, cycle_ids],
+        )
+        self.invalidate_model()
+        cache.invalidate(self.env)
+
+    @api.model
+    def _refresh_rows(self, score_ids):
+        """
+        Patch the rows of ``score_ids`` from med.employee.score, copying the
+        ranks the cycle's ranking pass just stored on them. Rows of deleted
+        scores go away with them (score_id cascades). Used by incremental
+        rescoring, where a chunk moves a handful of rows of a large board.
+        """
+        score_ids = list(score_ids)
+        if not score_ids:
+            return
+        self.env["med.employee.score"].flush_model()
+        self.env["hr.employee"].flush_model(["name", "med_area_id", "med_specialty_id"])
+        self.env["med.area"].flush_model(["name"])
+        self.env["med.specialty"].flush_model(["name"])
+
+        self.env.cr.execute("DELETE FROM med_leaderboard WHERE id = ANY(%s)", [score_ids])
+        self.env.cr.execute(
+            """
+            INSERT INTO med_leaderboard (
+                id, score_id, cycle_id, company_id,
+                employee_id, employee_name, area_id, area_name, specialty_id, specialty_name,
+                score_total, score_goals, score_productivity, score_quality, score_economic,
+                rank_global, rank_area, rank_specialty, is_top_performer
+            )
+            SELECT s.id, s.id, s.cycle_id, s.company_id,
+                   s.employee_id, e.name, e.med_area_id, a.name, e.med_specialty_id, sp.name,
+                   s.score_total, s.score_goals, s.score_productivity, s.score_quality, s.score_economic,
+                   s.rank_global, s.rank_area, s.rank_specialty, COALESCE(s.is_top_performer, false)
+              FROM med_employee_score s
+              JOIN hr_employee e ON e.id = s.employee_id
+         LEFT JOIN med_area a ON a.id = e.med_area_id
+         LEFT JOIN med_specialty sp ON sp.id = e.med_specialty_id
+             WHERE s.id = ANY(%s)
+            """,
+            [score_ids],
+        )
+        self.invalidate_model()
+        cache.invalidate(self.env)
+
+    @api.model
+    def _refresh_for_employees(self, employee_ids):
+        """
+        Rebuild the open boards and the latest closed board of each company
+        where these employees appear (area/specialty change).
+        """
+        self.env["med.employee.score"].flush_model(["employee_id", "cycle_id"])
+        self.env["med.evaluation.cycle"].flush_model(["state", "company_id", "date_end"])
+        self.env.cr.execute(
+            """
+            SELECT DISTINCT s.cycle_id
+              FROM med_employee_score s
+              JOIN med_evaluation_cycle c ON c.id = s.cycle_id
+             WHERE s.employee_id = ANY(%s)
+               AND (c.state != 'closed'
+                    OR c.id IN (
+                           SELECT DISTINCT ON (company_id) id
+                             FROM med_evaluation_cycle
+                            WHERE state = 'closed'
+                         ORDER BY company_id, date_end DESC, id DESC
+                       ))
+            """,
+            [list(employee_ids)],
+        )
+        self._refresh([row[0] for row in self.env.cr.fetchall()])
+
+    @api.model
+    def _rename_employees(self, employee_ids):
+        """Patch employee_name in place on every board (ranks do not depend on it)."""
+        self.env["hr.employee"].flush_model(["name"])
+        self.env["med.employee.score"].flush_model(["employee_id", "cycle_id"])
+        self.env.cr.execute(
+            """
+            UPDATE med_leaderboard l
+               SET employee_name = e.name
+              FROM hr_employee e
+             WHERE e.id = l.employee_id
+               AND l.employee_id = ANY(%(ids)s)
+               AND l.cycle_id IN (
+                       SELECT DISTINCT cycle_id FROM med_employee_score WHERE employee_id = ANY(%(ids)s)
+                   )
+               AND l.employee_name IS DISTINCT FROM e.name
+            """,
+            {"ids": list(employee_ids)},
+        )
+        if self.env.cr.rowcount:
+            self.invalidate_model(["employee_name"])
+            cache.invalidate(self.env)
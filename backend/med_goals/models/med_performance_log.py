@@ -1,5 +1,24 @@
+import logging
+
+from psycopg2 import sql
+
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.tools import str2bool
+from odoo.tools.sql import create_index, drop_index
+
+from ..services import partitioning
+
+_logger = logging.getLogger(__name__)
+
+# Fields whose change can move the productivity fallback of an open cycle.
+SCORE_FIELDS = {"employee_id", "date", "metric_value"}
+
+# Rows inserted per create() call (and per savepoint) by _bulk_ingest.
+BULK_CHUNK_SIZE = 1000
+
+# Monthly partitions prepared ahead of the current month (see _cron_manage_partitions).
+PARTITION_MONTHS_AHEAD = 3
 
 
 class MedPerformanceLog(models.Model):
@@ -11,6 +30,7 @@ class MedPerformanceLog(models.Model):
     date = fields.Datetime(
         default=lambda self: fields.Datetime.now(),
         required=True,
+        index=True,
     )
     company_id = fields.Many2one(
         "res.company",
@@ -34,6 +54,29 @@ class MedPerformanceLog(models.Model):
         help="Quantity measured in this log.",
     )
     notes = fields.Text()
+    idempotency_key = fields.Char(
+        readonly=True,
+        copy=False,
+        help="Client-supplied key making bulk ingestion retries safe.",
+    )
+
+    _sql_constraints = [
+        (
+            "idempotency_key_uniq",
+            "unique(company_id, idempotency_key)",
+            "This idempotency key was already used for another log.",
+        ),
+    ]
+
+    def init(self):
+        # Productivity fallback: logs of an employee within the cycle window.
+        # Its leading column serves every employee_id lookup, so the field
+        # keeps no single-column index (one index less per inserted log).
+        create_index(
+            self._cr, "med_performance_log_employee_date_idx", self._table,
+            ["employee_id", "date"],
+        )
+        drop_index(self._cr, "med_performance_log_employee_id_index", self._table)
 
     # BACK-END VALIDATION: SENSITIVE performance data PER LOG ENTRY
     @api.constrains("metric_value")
@@ -48,3 +91,244 @@ class MedPerformanceLog(models.Model):
         if self.assignment_id:
             self.employee_id = self.assignment_id.employee_id
             self.company_id = self.assignment_id.company_id
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._mark_scores_dirty()
+        records._update_daily_rollup(1)
+        return records
+
+    def write(self, vals):
+        tracked = SCORE_FIELDS.intersection(vals)
+        if tracked:
+            self._update_daily_rollup(-1)
+        if tracked & {"employee_id", "date"}:
+            self._mark_scores_dirty()
+        res = super().write(vals)
+        if tracked:
+            self._mark_scores_dirty()
+            self._update_daily_rollup(1)
+        return res
+
+    def unlink(self):
+        self._mark_scores_dirty()
+        self._update_daily_rollup(-1)
+        return super().unlink()
+
+    def _update_daily_rollup(self, sign):
+        """Add (sign=1) or remove (sign=-1) these logs from the daily totals."""
+        self.env["med.performance.log.daily"].sudo()._apply_deltas(
+            (rec.employee_id.id, rec.date.date(), sign * (rec.metric_value or 0.0), sign)
+            for rec in self if rec.date
+        )
+
+    # -------------------------------------------------------------------------
+    # BULK INGESTION
+    # -------------------------------------------------------------------------
+    @api.model
+    def _bulk_ingest(self, rows, chunk_size=BULK_CHUNK_SIZE):
+        """
+        Validate and insert many log rows at once. Validation runs as one
+        pass over the batch (employees, assignments and idempotency keys are
+        each fetched with a single query) and valid rows are created with one
+        multi-row ``create`` per chunk, each chunk in its own savepoint.
+
+        Returns one result per input row, in order:
+        ``{"index", "status": "created" | "duplicate" | "error", "id", "message"}``.
+        """
+        results = [{"index": i, "status": "error", "id": None, "message": None} for i in range(len(rows))]
+        vals_by_index = self._bulk_prepare_vals(rows, results)
+
+        # Idempotency: keys already stored, then repeats inside the batch.
+        keys = {(vals["company_id"], vals["idempotency_key"]) for vals in vals_by_index.values()
+                if vals.get("idempotency_key")}
+        existing = {}
+        if keys:
+            companies, key_values = zip(*keys)
+            for log in self.search_read(
+                [("company_id", "in", list(set(companies))), ("idempotency_key", "in", list(set(key_values)))],
+                ["company_id", "idempotency_key"],
+                load=None,
+            ):
+                existing[(log["company_id"], log["idempotency_key"])] = log["id"]
+
+        pending = []
+        first_index_by_key = {}
+        repeated = []
+        for index, vals in vals_by_index.items():
+            key = (vals["company_id"], vals["idempotency_key"]) if vals.get("idempotency_key") else None
+            if key in existing:
+                results[index].update(status="duplicate", id=existing[key])
+            elif key in first_index_by_key:
+                repeated.append((index, first_index_by_key[key]))
+            else:
+                if key:
+                    first_index_by_key[key] = index
+                pending.append((index, vals))
+
+        for start in range(0, len(pending), chunk_size):
+            self._bulk_create_chunk(pending[start:start + chunk_size], results)
+
+        # A key repeated inside the batch resolves to the row that used it first.
+        for index, first_index in repeated:
+            first = results[first_index]
+            if first["status"] == "created":
+                results[index].update(status="duplicate", id=first["id"])
+            else:
+                results[index]["message"] = first["message"]
+        return results
+
+    @api.model
+    def _bulk_prepare_vals(self, rows, results):
+        """
+        Vectorized validation: same rules as _check_metric_value and the
+        employee/company sync of _onchange_assignment_id. Returns
+        ``{index: vals}`` for the valid rows and fills ``results`` for the rest.
+        """
+        def to_id(value):
+            return value if isinstance(value, int) and not isinstance(value, bool) and value > 0 else None
+
+        employee_ids = {to_id(row.get("employee_id")) for row in rows if isinstance(row, dict)}
+        assignment_ids = {to_id(row.get("assignment_id")) for row in rows if isinstance(row, dict)}
+        employees = {
+            rec["id"]: rec for rec in self.env["hr.employee"].search_read(
+                [("id", "in", [i for i in employee_ids if i])], ["company_id"], load=None,
+            )
+        }
+        assignments = {
+            rec["id"]: rec for rec in self.env["med.goal.assignment"].search_read(
+                [("id", "in", [i for i in assignment_ids if i])], ["employee_id", "company_id"], load=None,
+            )
+        }
+
+        vals_by_index = {}
+        for index, row in enumerate(rows):
+            error = None
+            if not isinstance(row, dict):
+                error = _("Each row must be a JSON object.")
+            elif not row.get("name"):
+                error = _("Missing required field: name.")
+            else:
+                employee_id = to_id(row.get("employee_id"))
+                assignment_id = to_id(row.get("assignment_id"))
+                assignment = assignments.get(assignment_id)
+                metric_value = row.get("metric_value") or 0.0
+                if row.get("assignment_id") and not assignment:
+                    error = _("Goal assignment not found.")
+                elif assignment and employee_id and employee_id != assignment["employee_id"]:
+                    error = _("The goal assignment belongs to another employee.")
+                elif not (employee_id or assignment):
+                    error = _("Missing required field: employee_id.")
+                elif not isinstance(metric_value, (int, float)) or isinstance(metric_value, bool):
+                    error = _("Measured value must be a number.")
+                elif metric_value < 0:
+                    error = _("Measured value cannot be negative.")
+                else:
+                    employee_id = employee_id or assignment["employee_id"]
+                    employee = employees.get(employee_id)
+                    if not assignment and not employee:
+                        error = _("Employee not found.")
+            if error:
+                results[index]["message"] = error
+                continue
+
+            vals = {
+                "name": row["name"],
+                "employee_id": employee_id,
+                "assignment_id": assignment["id"] if assignment else False,
+                # Same sync as _onchange_assignment_id.
+                "company_id": (assignment or employee)["company_id"] or self.env.company.id,
+                "metric_value": metric_value,
+                "notes": row.get("notes"),
+                "idempotency_key": row.get("idempotency_key") or False,
+            }
+            if row.get("date"):
+                try:
+                    vals["date"] = fields.Datetime.to_datetime(row["date"])
+                except (TypeError, ValueError):
+                    results[index]["message"] = _("Invalid date.")
+                    continue
+            vals_by_index[index] = vals
+        return vals_by_index
+
+    @api.model
+    def _bulk_create_chunk(self, chunk, results):
+        """Create one chunk in a savepoint; if it fails, retry row by row to isolate the culprits."""
+        if len(chunk) > 1:
+            try:
+                with self.env.cr.savepoint():
+                    records = self.create([vals for _index, vals in chunk])
+            except Exception:
+                _logger.info("Bulk log chunk of %s rows failed, retrying row by row", len(chunk))
+            else:
+                for (index, _vals), record in zip(chunk, records):
+                    results[index].update(status="created", id=record.id)
+                return
+
+        for index, vals in chunk:
+            try:
+                with self.env.cr.savepoint():
+                    record = self.create(vals)
+            except Exception as exc:
+                results[index]["message"] = str(exc.args[0] if exc.args else exc)
+            else:
+                results[index].update(status="created", id=record.id)
+
+    # -------------------------------------------------------------------------
+    # TIME PARTITIONING (optional)
+    # -------------------------------------------------------------------------
+    @api.model
+    def _cron_manage_partitions(self):
+        """
+        With med_goals.log_partitioning enabled: convert the table to monthly
+        range partitions on ``date`` (first run only), keep partitions ready
+        for the coming months, and detach the months older than
+        med_goals.log_retention_months (0 keeps everything). Detached months
+        stay as standalone tables for archival; nothing is deleted row by row,
+        but their days leave med.performance.log.daily like an unlink would,
+        so the rollup and the log-based productivity kernel keep agreeing.
+        """
+        ICP = self.env["ir.config_parameter"].sudo()
+        if not str2bool(ICP.get_param("med_goals.log_partitioning", "False")):
+            return
+        cr = self.env.cr
+        self.flush_model()
+        if not partitioning.is_partitioned(cr, self._table):
+            partitioning.convert_to_partitioned(cr, self._table, "date")
+
+        today = fields.Date.today()
+        ahead = int(ICP.get_param("med_goals.log_partition_months_ahead", PARTITION_MONTHS_AHEAD))
+        for shift in range(ahead + 1):
+            partitioning.create_partition(cr, self._table, "date", partitioning.month_start(today, shift))
+
+        retention = int(ICP.get_param("med_goals.log_retention_months", 0))
+        if retention > 0:
+            cutoff = partitioning.month_start(today, -retention)
+            for name, month in partitioning.list_partitions(cr, self._table):
+                if month < cutoff:
+                    self._remove_partition_from_rollup(name)
+                    partitioning.detach_partition(cr, self._table, name)
+                    _logger.info("Detached performance log partition %s", name)
+        self.invalidate_model()
+
+    @api.model
+    def _remove_partition_from_rollup(self, partition):
+        """Subtract the per-day totals of ``partition`` from the daily rollup."""
+        self.env.cr.execute(
+            sql.SQL(
+                """
+                SELECT employee_id, date::date, -SUM(COALESCE(metric_value, 0)), -COUNT(*)
+                  FROM {}
+                 WHERE date IS NOT NULL
+              GROUP BY employee_id, date::date
+                """
+            ).format(sql.Identifier(partition))
+        )
+        self.env["med.performance.log.daily"].sudo()._apply_deltas(self.env.cr.fetchall())
+
+    def _mark_scores_dirty(self):
+        """Flag the employees of these logs in the open cycles covering their date."""
+        self.env["med.score.dirty"].sudo()._mark_dates(
+            (rec.employee_id.id, rec.date.date()) for rec in self if rec.date
+        )
@@ -0,0 +1,156 @@
+import json
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Defaults of the ir.config_parameter knobs (med_goals.log_queue_*).
+LOG_QUEUE_FLUSH_SIZE = 5000        # rows per drain transaction
+LOG_QUEUE_MAX_LATENCY = 60         # seconds before a queued row is drained
+LOG_QUEUE_MAX_DEPTH = 1000000      # pending rows before producers are refused
+LOG_QUEUE_TIME_BUDGET = 120.0      # seconds per cron run
+
+
+class LogQueueFull(Exception):
+    """Raised by _enqueue when the queue is deeper than med_goals.log_queue_max_depth."""
+
+
+class MedPerformanceLogQueue(models.Model):
+    """
+    Write-behind staging table for performance log ingestion. Producers pay
+    one multi-row INSERT; _cron_drain moves the rows into med.performance.log
+    in large transactions through the same _bulk_ingest path as the
+    synchronous endpoint. Rows that fail validation stay here as "failed".
+    """
+
+    _name = "med.performance.log.queue"
+    _description = "Performance Log Ingestion Queue"
+    _order = "id"
+    _log_access = False
+
+    payload = fields.Json(required=True, readonly=True)
+    user_id = fields.Many2one("res.users", string="Queued By", readonly=True, ondelete="cascade")
+    enqueued_at = fields.Datetime(readonly=True)
+    state = fields.Selection(
+        [("pending", "Pending"), ("failed", "Failed")],
+        default="pending",
+        required=True,
+        readonly=True,
+        index=True,
+    )
+    error = fields.Char(readonly=True)
+
+    @api.model
+    def _get_queue_params(self):
+        ICP = self.env["ir.config_parameter"].sudo()
+        return {
+            "flush_size": int(ICP.get_param("med_goals.log_queue_flush_size", LOG_QUEUE_FLUSH_SIZE)),
+            "max_latency": int(ICP.get_param("med_goals.log_queue_max_latency", LOG_QUEUE_MAX_LATENCY)),
+            "max_depth": int(ICP.get_param("med_goals.log_queue_max_depth", LOG_QUEUE_MAX_DEPTH)),
+            "time_budget": float(ICP.get_param("med_goals.log_queue_time_budget", LOG_QUEUE_TIME_BUDGET)),
+        }
+
+    @api.model
+    def _pending_depth(self, cap):
+        """Number of pending rows, counted up to ``cap`` only (bounded cost)."""
+        self.env.cr.execute(
+            "SELECT count(*) FROM (SELECT 1 FROM med_performance_log_queue WHERE state = 'pending' LIMIT %s) q",
+            [cap],
+        )
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _enqueue(self, rows):
+        """
+        Append ``rows`` with a single INSERT and schedule the drain: right
+        away once a flush worth of rows is waiting, otherwise after the
+        configured latency. Raises LogQueueFull past the maximum depth.
+        """
+        if not rows:
+            return 0
+        params = self._get_queue_params()
+        depth = self._pending_depth(params["max_depth"] + 1)
+        if depth + len(rows) > params["max_depth"]:
+            raise LogQueueFull()
+
+        self.env.cr.execute(
+            """
+            INSERT INTO med_performance_log_queue (payload, user_id, enqueued_at, state)
+            SELECT p, %s, (now() at time zone 'UTC'), 'pending'
+              FROM unnest(%s::jsonb[]) AS p
+            """,
+            [self.env.uid, [json.dumps(row) for row in rows]],
+        )
+
+        cron = self.env.ref("med_goals.ir_cron_med_goals_log_queue", raise_if_not_found=False)
+        if cron:
+            if depth < params["flush_size"] <= depth + len(rows):
+                cron.sudo()._trigger()
+            elif depth == 0:
+                cron.sudo()._trigger(fields.Datetime.now() + timedelta(seconds=params["max_latency"]))
+        return len(rows)
+
+    @api.model
+    def _cron_drain(self):
+        """
+        Drain pending rows into med.performance.log, one committed
+        transaction per flush, until the queue is empty or the time budget
+        is spent. Rows are claimed with SKIP LOCKED so runs never overlap.
+        """
+        params = self._get_queue_params()
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        deadline = time.monotonic() + params["time_budget"]
+        Log = self.env["med.performance.log"]
+
+        while time.monotonic() < deadline:
+            self.env.cr.execute(
+                """
+                SELECT id, user_id, payload
+                  FROM med_performance_log_queue
+                 WHERE state = 'pending'
+              ORDER BY id
+                 LIMIT %s
+                   FOR UPDATE SKIP LOCKED
+                """,
+                [params["flush_size"]],
+            )
+            claimed = self.env.cr.fetchall()
+            if not claimed:
+                break
+
+            rows_by_user = {}
+            for queue_id, user_id, payload in claimed:
+                rows_by_user.setdefault(user_id, []).append((queue_id, payload))
+
+            done_ids, failed = [], []
+            for user_id, entries in rows_by_user.items():
+                ingest = Log.with_user(user_id) if user_id else Log
+                results = ingest.sudo()._bulk_ingest([payload for _queue_id, payload in entries])
+                for (queue_id, _payload), result in zip(entries, results):
+                    if result["status"] == "error":
+                        failed.append((queue_id, result["message"]))
+                    else:
+                        done_ids.append(queue_id)
+
+            self.env.cr.execute("DELETE FROM med_performance_log_queue WHERE id = ANY(%s)", [done_ids])
+            if failed:
+                failed_ids, errors = zip(*failed)
+                self.env.cr.execute(
+                    """
+                    UPDATE med_performance_log_queue q
+                       SET state = 'failed', error = f.error
+                      FROM unnest(%s::int[], %s::varchar[]) AS f(id, error)
+                     WHERE q.id = f.id
+                    """,
+                    [list(failed_ids), list(errors)],
+                )
+            _logger.info("Drained %s queued performance logs (%s failed)", len(claimed), len(failed))
+            if auto_commit:
+                self.env.cr.commit()
+            self.env.invalidate_all()
+            if len(claimed) < params["flush_size"]:
+                break
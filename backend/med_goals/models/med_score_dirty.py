@@ -0,0 +1,105 @@
+from odoo import models, fields, api
+
+
+class MedScoreDirty(models.Model):
+    _name = "med.score.dirty"
+    _description = "Employee Score Pending Recompute"
+    _log_access = False
+
+    employee_id = fields.Many2one(
+        "hr.employee",
+        string="Employee",
+        required=True,
+        ondelete="cascade",
+    )
+    cycle_id = fields.Many2one(
+        "med.evaluation.cycle",
+        string="Evaluation Cycle",
+        required=True,
+        index=True,
+        ondelete="cascade",
+    )
+
+    _sql_constraints = [
+        (
+            "employee_cycle_uniq",
+            "unique(employee_id, cycle_id)",
+            "An employee can only be flagged once per evaluation cycle.",
+        ),
+    ]
+
+    @api.model
+    def _mark(self, pairs):
+        """
+        Flag (employee_id, cycle_id) pairs for recompute. Only open cycles
+        are tracked; pairs already flagged are ignored.
+        """
+        pairs = {(emp_id, cycle_id) for emp_id, cycle_id in pairs if emp_id and cycle_id}
+        if not pairs:
+            return
+        self.env["med.evaluation.cycle"].flush_model(["state"])
+        employee_ids, cycle_ids = zip(*pairs)
+        self.env.cr.execute(
+            """
+            INSERT INTO med_score_dirty (employee_id, cycle_id)
+            SELECT p.employee_id, p.cycle_id
+              FROM unnest(%s::int[], %s::int[]) AS p(employee_id, cycle_id)
+              JOIN med_evaluation_cycle c ON c.id = p.cycle_id AND c.state = 'open'
+                ON CONFLICT DO NOTHING
+            """,
+            [list(employee_ids), list(cycle_ids)],
+        )
+
+    @api.model
+    def _mark_dates(self, employee_days):
+        """
+        Flag employees for every open cycle whose period covers the given
+        day and in which they have assignments (used by performance logs).
+        """
+        employee_days = {(emp_id, day) for emp_id, day in employee_days if emp_id and day}
+        if not employee_days:
+            return
+        self.env["med.evaluation.cycle"].flush_model(["state", "date_start", "date_end"])
+        self.env["med.goal.assignment"].flush_model(["employee_id", "evaluation_cycle_id"])
+        employee_ids, days = zip(*employee_days)
+        self.env.cr.execute(
+            """
+            INSERT INTO med_score_dirty (employee_id, cycle_id)
+            SELECT DISTINCT p.employee_id, c.id
+              FROM unnest(%s::int[], %s::date[]) AS p(employee_id, day)
+              JOIN med_evaluation_cycle c
+                ON c.state = 'open' AND p.day BETWEEN c.date_start AND c.date_end
+             WHERE EXISTS (
+                       SELECT 1
+                         FROM med_goal_assignment a
+                        WHERE a.employee_id = p.employee_id
+                          AND a.evaluation_cycle_id = c.id
+                   )
+                ON CONFLICT DO NOTHING
+            """,
+            [list(employee_ids), list(days)],
+        )
+
+    @api.model
+    def _consume(self, cycle, limit=None):
+        """Remove and return the employee ids flagged for ``cycle`` (at most ``limit``)."""
+        if limit is None:
+            self.env.cr.execute(
+                "DELETE FROM med_score_dirty WHERE cycle_id = %s RETURNING employee_id",
+                [cycle.id],
+            )
+        else:
+            self.env.cr.execute(
+                """
+                DELETE FROM med_score_dirty
+                 WHERE id IN (
+                           SELECT id FROM med_score_dirty
+                            WHERE cycle_id = %s
+                         ORDER BY employee_id
+                            LIMIT %s
+                       )
+             RETURNING employee_id
+                """,
+                [cycle.id, limit],
+            )
+        return [row[0] for row in self.env.cr.fetchall()]
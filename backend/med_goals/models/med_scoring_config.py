@@ -22,6 +22,24 @@ class MedScoringConfig(models.Model):
     weight_quality = fields.Float(string="Quality Weight", default=0.0)
     weight_economic = fields.Float(string="Economic Contribution Weight", default=0.0)
 
+    score_kernel = fields.Selection(
+        [
+            ("python", "Python (strategies)"),
+            ("numpy", "NumPy (vectorized)"),
+        ],
+        string="Scoring Kernel",
+        default="python",
+        required=True,
+        help="Implementation used to compute a whole cycle. The NumPy kernel requires numpy "
+             "on the server and falls back to the Python kernel otherwise.",
+    )
+    use_log_rollup = fields.Boolean(
+        string="Use Daily Log Rollup",
+        default=False,
+        help="Read the productivity fallback from the per-employee daily totals "
+             "instead of summing every performance log of the cycle.",
+    )
+
     normalized = fields.Boolean(
         string="Weights Sum to 1",
         compute="_compute_normalized",
@@ -5,5 +5,10 @@ Separating these utilities keeps controllers and models focused on
 business rules while the services encapsulate cross-cutting concerns
 like serialization or scoring strategies.
 """
+from . import cache
+from . import metrics
+from . import parallel_scoring
+from . import partitioning
 from . import score_engine
 from . import serializers
+from . import vectorized_engine
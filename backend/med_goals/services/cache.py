@@ -0,0 +1,108 @@
+"""
+In-process LRU + TTL cache for hot API payloads.
+
+Keys are prefixed with a generation counter that score and cycle writes
+bump (see ``invalidate``), so a write makes every cached payload
+unreachable at once, including values computed concurrently from the old
+state. The TTL bounds staleness for changes made by other server
+processes, and a byte ceiling keeps memory use predictable.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+DEFAULT_TTL = 30.0                 # seconds
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+_POSTCOMMIT_KEY = "med_goals.payload_cache.bump"
+
+
+class PayloadCache:
+    """Thread-safe LRU cache with per-entry TTL and a memory ceiling."""
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get_or_set(self, key: Hashable, producer: Callable[[], Any]) -> Any:
+        """
+        Cached value for ``key`` or the result of ``producer()``, stored for
+        the next callers. Cached values are shared: treat them as read-only.
+        """
+        full_key = (self.generation, key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        value = producer()
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            if full_key[0] != self.generation:
+                # Invalidated while computing: do not store a stale payload.
+                return value
+            self._discard(full_key)
+            self._entries[full_key] = (now + self.ttl, size, value)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+        return value
+
+    def bump_generation(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "generation": self.generation,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+
+payload_cache = PayloadCache()
+
+
+def invalidate(env) -> None:
+    """
+    Bump the cache generation now and once more after the transaction
+    commits, so payloads rebuilt before the commit are dropped as well.
+    """
+    payload_cache.bump_generation()
+    postcommit = env.cr.postcommit
+    if not postcommit.data.get(_POSTCOMMIT_KEY):
+        postcommit.data[_POSTCOMMIT_KEY] = True
+        postcommit.add(payload_cache.bump_generation)
@@ -0,0 +1,167 @@
+"""
+In-process per-route metrics for the MED-GOALS API.
+
+Counters are kept per worker process and per route template (e.g.
+``/med_goals/api/employees/<int:employee_id>``), so cardinality stays bounded
+by the number of routes. Request metrics are rolling summaries: quantiles
+over the last ``SUMMARY_WINDOW`` requests of a route, sum and count since the
+worker started, rendered in the Prometheus text exposition format.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+from typing import Dict, Iterable, List
+
+SUMMARY_WINDOW = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+
+# name -> help text, in exposition order
+REQUEST_METRICS = {
+    "duration_seconds": "Wall time spent dispatching the request.",
+    "sql_queries": "SQL queries executed by the request.",
+    "sql_seconds": "Time spent in SQL queries by the request.",
+    "orm_records": "Records fetched from the database by the ORM.",
+    "response_bytes": "Size of the response body as sent.",
+}
+SIZE_COUNTERS = {
+    "raw_bytes": "Response bytes before compression.",
+    "sent_bytes": "Response bytes after compression.",
+    "over_budget": "Responses larger than med_goals.payload_budget_bytes.",
+}
+PREFIX = "med_goals_api_"
+# PayloadCache.stats() key -> (type, help text)
+CACHE_METRICS = {
+    "hits": ("counter", "Payload cache hits."),
+    "misses": ("counter", "Payload cache misses."),
+    "evictions": ("counter", "Payloads evicted by the LRU or the memory ceiling."),
+    "entries": ("gauge", "Payloads currently cached."),
+    "bytes": ("gauge", "Estimated size of the cached payloads."),
+    "generation": ("gauge", "Invalidation generation of the payload cache."),
+}
+CACHE_PREFIX = "med_goals_payload_cache_"
+
+
+class RouteSizeStats:
+    """Response sizes of one route: before and after compression."""
+
+    __slots__ = ("count", "raw_bytes", "sent_bytes", "max_raw_bytes", "over_budget")
+
+    def __init__(self):
+        self.count = 0
+        self.raw_bytes = 0
+        self.sent_bytes = 0
+        self.max_raw_bytes = 0
+        self.over_budget = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class RollingSummary:
+    """Quantiles over a sliding window of samples, cumulative sum and count."""
+
+    __slots__ = ("samples", "count", "total")
+
+    def __init__(self, window: int = SUMMARY_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def quantiles(self, quantiles: Iterable[float] = QUANTILES) -> Dict[float, float]:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {q: math.nan for q in quantiles}
+        # nearest-rank
+        return {q: ordered[max(0, math.ceil(q * len(ordered)) - 1)] for q in quantiles}
+
+
+class MetricsRegistry:
+    def __init__(self, window: int = SUMMARY_WINDOW):
+        self._lock = threading.Lock()
+        self._window = window
+        self._sizes: Dict[str, RouteSizeStats] = {}
+        self._requests: Dict[str, Dict[str, RollingSummary]] = {}
+
+    def record_response_size(self, route: str, raw_bytes: int, sent_bytes: int, over_budget: bool = False) -> None:
+        with self._lock:
+            stats = self._sizes.get(route)
+            if stats is None:
+                stats = self._sizes[route] = RouteSizeStats()
+            stats.count += 1
+            stats.raw_bytes += raw_bytes
+            stats.sent_bytes += sent_bytes
+            stats.max_raw_bytes = max(stats.max_raw_bytes, raw_bytes)
+            stats.over_budget += int(over_budget)
+
+    def response_sizes(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return self._size_dicts()
+
+    def _size_dicts(self) -> Dict[str, Dict[str, int]]:
+        return {route: stats.as_dict() for route, stats in self._sizes.items()}
+
+    def observe_request(self, route: str, values: Dict[str, float]) -> None:
+        """Add one request to the summaries of ``route`` (keys of REQUEST_METRICS)."""
+        with self._lock:
+            summaries = self._requests.get(route)
+            if summaries is None:
+                summaries = self._requests[route] = {
+                    name: RollingSummary(self._window) for name in REQUEST_METRICS
+                }
+            for name, value in values.items():
+                summaries[name].observe(value)
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            requests = {
+                route: {name: (s.quantiles(), s.total, s.count) for name, s in summaries.items()}
+                for route, summaries in self._requests.items()
+            }
+            sizes = self._size_dicts()
+
+        lines: List[str] = []
+        for name, help_text in REQUEST_METRICS.items():
+            metric = PREFIX + name
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} summary"]
+            for route in sorted(requests):
+                quantiles, total, count = requests[route][name]
+                label = f'route="{_escape(route)}"'
+                for q, value in quantiles.items():
+                    lines.append(f'{metric}{{{label},quantile="{q}"}} {_number(value)}')
+                lines.append(f"{metric}_sum{{{label}}} {_number(total)}")
+                lines.append(f"{metric}_count{{{label}}} {count}")
+        for name, help_text in SIZE_COUNTERS.items():
+            metric = f"{PREFIX}response_{name}_total"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            for route in sorted(sizes):
+                lines.append(f'{metric}{{route="{_escape(route)}"}} {sizes[route][name]}')
+        return "\n".join(lines) + "\n"
+
+
+def render_cache_stats(stats: Dict[str, int]) -> str:
+    """``PayloadCache.stats()`` in the Prometheus text format."""
+    lines: List[str] = []
+    for name, (kind, help_text) in CACHE_METRICS.items():
+        metric = CACHE_PREFIX + name + ("_total" if kind == "counter" else "")
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}", f"{metric} {stats.get(name, 0)}"]
+    return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+registry = MetricsRegistry()
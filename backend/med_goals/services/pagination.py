@@ -0,0 +1,114 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A page is selected with a domain on the sort keys of the last row seen
+("after this row" / "before this row") instead of an OFFSET, so every page
+costs the same index range scan no matter how deep it is. Cursors are
+opaque URL-safe tokens carrying the direction and the key values.
+"""
+import base64
+import json
+from typing import List, Optional, Sequence, Tuple
+
+# Sort keys: [(field_name, "asc" | "desc"), ...]; the last key must be unique (id).
+Keys = Sequence[Tuple[str, str]]
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded."""
+
+
+def encode_cursor(direction: str, values: Sequence) -> str:
+    raw = json.dumps([direction, list(values)], separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[str, list]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        direction, values = json.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid pagination cursor.") from exc
+    if direction not in ("next", "prev") or not isinstance(values, list):
+        raise InvalidCursor("Invalid pagination cursor.")
+    return direction, values
+
+
+def keyset_domain(keys: Keys, values: Sequence, backwards: bool = False) -> list:
+    """
+    Domain for rows strictly after ``values`` in the ``keys`` ordering
+    (strictly before when ``backwards``): (a > x) OR (a = x AND b > y) ...
+    """
+    if len(values) != len(keys):
+        raise InvalidCursor("Invalid pagination cursor.")
+    branches = []
+    for i, (fname, direction) in enumerate(keys):
+        ascending = (direction == "asc") != backwards
+        terms = [(keys[j][0], "=", values[j]) for j in range(i)]
+        terms.append((fname, ">" if ascending else "<", values[i]))
+        branches.append(["&"] * (len(terms) - 1) + terms)
+    domain = ["|"] * (len(branches) - 1)
+    for branch in branches:
+        domain += branch
+    return domain
+
+
+def order_by(keys: Keys, backwards: bool = False) -> str:
+    flip = {"asc": "desc", "desc": "asc"}
+    return ", ".join(f"{fname} {flip[d] if backwards else d}" for fname, d in keys)
+
+
+def keyset_page(
+    model,
+    domain: list,
+    keys: Keys,
+    limit: int,
+    fields: List[str],
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    **read_kwargs,
+):
+    """
+    ``search_read`` one page of ``model`` ordered by ``keys``.
+
+    Returns ``(records, next_cursor, prev_cursor)``. ``offset`` is only
+    honoured for the first request of legacy page/offset clients; the
+    cursors returned move them onto keyset pagination. Extra keyword
+    arguments (e.g. ``load=None``) are passed to ``search_read``.
+    """
+    backwards = False
+    page_domain = list(domain)
+    if cursor:
+        direction, values = decode_cursor(cursor)
+        backwards = direction == "prev"
+        page_domain += keyset_domain(keys, values, backwards)
+        offset = 0
+
+    key_names = [fname for fname, _direction in keys]
+    read_fields = list(fields) + [f for f in key_names if f not in fields]
+    records = model.search_read(
+        page_domain,
+        fields=read_fields,
+        limit=limit + 1,
+        offset=offset,
+        order=order_by(keys, backwards),
+        **read_kwargs,
+    )
+    has_more = len(records) > limit
+    records = records[:limit]
+    if backwards:
+        records.reverse()
+
+    has_next = has_more if not backwards else True
+    has_prev = bool(cursor or offset) if not backwards else has_more
+    next_cursor = prev_cursor = None
+    if records and has_next:
+        next_cursor = encode_cursor("next", [records[-1][f] for f in key_names])
+    if records and has_prev:
+        prev_cursor = encode_cursor("prev", [records[0][f] for f in key_names])
+
+    extra = [f for f in key_names if f not in fields and f != "id"]
+    for rec in records:
+        for fname in extra:
+            rec.pop(fname, None)
+    return records, next_cursor, prev_cursor
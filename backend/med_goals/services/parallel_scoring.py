@@ -0,0 +1,67 @@
+"""
+Process-pool scoring for batch cycle closes.
+
+Each task scores one (cycle, employee shard) pair in a separate process
+with its own registry cursor and returns plain ``{employee_id: breakdown}``
+dicts; workers never write. The parent merges the shards per cycle and
+persists/ranks them in its own transaction, so a failed close leaves no
+partial state and can simply be retried.
+
+Workers only see committed data: callers should not rely on uncommitted
+changes made earlier in the same transaction.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple
+
+_logger = logging.getLogger(__name__)
+
+
+def _init_worker(options: dict) -> None:
+    """Spawned interpreters start from scratch: reload the server config."""
+    import odoo
+    from odoo.modules.module import initialize_sys_path
+
+    odoo.tools.config.options.update(options)
+    initialize_sys_path()
+
+
+def _score_shard(dbname: str, uid: int, context: dict, su: bool, cycle_id: int, employee_ids: List[int]):
+    from odoo import api
+    from odoo.modules.registry import Registry
+
+    registry = Registry(dbname)
+    with registry.cursor() as cr:
+        env = api.Environment(cr, uid, context, su)
+        cycle = env["med.evaluation.cycle"].browse(cycle_id)
+        breakdowns = cycle._compute_breakdowns(employee_ids)
+        cr.rollback()
+    return cycle_id, breakdowns
+
+
+def score_shards_in_parallel(
+    env, shards: Sequence[Tuple[int, List[int]]], workers: int
+) -> Dict[int, Dict[int, Dict[str, float]]]:
+    """Score ``(cycle_id, employee_ids)`` shards on ``workers`` processes."""
+    from odoo.tools import config
+
+    env.flush_all()
+    merged: Dict[int, Dict[int, Dict[str, float]]] = {}
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(shards)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(dict(config.options),),
+    ) as pool:
+        futures = [
+            pool.submit(_score_shard, env.cr.dbname, env.uid, dict(env.context), env.su, cycle_id, employee_ids)
+            for cycle_id, employee_ids in shards
+        ]
+        for future in futures:
+            cycle_id, breakdowns = future.result()
+            merged.setdefault(cycle_id, {}).update(breakdowns)
+    _logger.info("Scored %s shards on %s worker processes", len(shards), workers)
+    return merged
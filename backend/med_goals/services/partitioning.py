@@ -0,0 +1,178 @@
+"""
+Monthly range partitioning of an ORM table on a timestamp column.
+
+Used for ``med_performance_log`` (see ``MedPerformanceLog._cron_manage_partitions``).
+Partitions are named ``<table>_pYYYY_MM`` and cover ``[month, next month)``;
+a ``<table>_pdefault`` partition catches rows outside the prepared range and
+is emptied into the right partition when that month gets created. Detached
+partitions become plain tables, left in place for archival.
+
+PostgreSQL requires unique constraints of a partitioned table to contain the
+partition key, so the primary key becomes ``(id, <column>)`` and unique
+constraints not covering the column are not carried over.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from datetime import date
+from typing import List, Tuple
+
+from psycopg2 import sql
+
+_logger = logging.getLogger(__name__)
+
+_PARTITION_RE = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def month_start(day: date, shift: int = 0) -> date:
+    """First day of the month of ``day``, moved by ``shift`` months."""
+    index = day.year * 12 + day.month - 1 + shift
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+
+def is_partitioned(cr, table: str) -> bool:
+    cr.execute(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+        [table],
+    )
+    return bool(cr.fetchone())
+
+
+def list_partitions(cr, table: str) -> List[Tuple[str, date]]:
+    """``[(partition name, month)]`` of the monthly partitions attached to ``table``."""
+    cr.execute(
+        """
+        SELECT c.relname
+          FROM pg_inherits i
+          JOIN pg_class c ON c.oid = i.inhrelid
+         WHERE i.inhparent = to_regclass(%s)
+        """,
+        [table],
+    )
+    partitions = []
+    for (name,) in cr.fetchall():
+        match = _PARTITION_RE.search(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def convert_to_partitioned(cr, table: str, column: str) -> None:
+    """
+    Rebuild ``table`` as ``PARTITION BY RANGE (column)``, with one partition
+    per month holding data plus a default partition. Runs in the caller's
+    transaction under an exclusive lock; the data is copied once.
+    """
+    legacy = f"{table}_legacy"
+    ident = sql.Identifier
+    cr.execute(sql.SQL("LOCK TABLE {} IN ACCESS EXCLUSIVE MODE").format(ident(table)))
+
+    # Secondary indexes and foreign keys are recreated on the new parent; they
+    # are read before the rename, so their definitions already name ``table``.
+    cr.execute(
+        """
+        SELECT pg_get_indexdef(x.indexrelid)
+          FROM pg_index x
+         WHERE x.indrelid = to_regclass(%s) AND NOT x.indisunique
+        """,
+        [table],
+    )
+    indexes = [row[0] for row in cr.fetchall()]
+    cr.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid)
+          FROM pg_constraint
+         WHERE conrelid = to_regclass(%s) AND contype = 'f'
+        """,
+        [table],
+    )
+    foreign_keys = cr.fetchall()
+    cr.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+    sequence = cr.fetchone()[0]
+
+    cr.execute(sql.SQL("ALTER TABLE {} RENAME TO {}").format(ident(table), ident(legacy)))
+    if sequence:
+        cr.execute(sql.SQL("ALTER SEQUENCE {} OWNED BY NONE").format(sql.SQL(sequence)))
+    cr.execute(
+        sql.SQL(
+            "CREATE TABLE {} (LIKE {} INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS)"
+            " PARTITION BY RANGE ({})"
+        ).format(ident(table), ident(legacy), ident(column))
+    )
+    cr.execute(
+        sql.SQL("CREATE TABLE {} PARTITION OF {} DEFAULT").format(ident(f"{table}_pdefault"), ident(table))
+    )
+
+    cr.execute(
+        sql.SQL("SELECT DISTINCT date_trunc('month', {})::date FROM {} WHERE {} IS NOT NULL").format(
+            ident(column), ident(legacy), ident(column)
+        )
+    )
+    for (month,) in cr.fetchall():
+        create_partition(cr, table, column, month)
+
+    cr.execute(sql.SQL("INSERT INTO {} SELECT * FROM {}").format(ident(table), ident(legacy)))
+    cr.execute(sql.SQL("DROP TABLE {}").format(ident(legacy)))
+    if sequence:
+        cr.execute(
+            sql.SQL("ALTER SEQUENCE {} OWNED BY {}.id").format(sql.SQL(sequence), ident(table))
+        )
+    # The legacy constraints and indexes went away with their table: their
+    # names are free again. Building them after the copy is also faster.
+    cr.execute(
+        sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} PRIMARY KEY (id, {})").format(
+            ident(table), ident(f"{table}_pkey"), ident(column)
+        )
+    )
+    for definition in indexes:
+        cr.execute(definition)
+    for name, definition in foreign_keys:
+        cr.execute(
+            sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} ").format(ident(table), ident(name))
+            + sql.SQL(definition)
+        )
+    _logger.info("Table %s converted to monthly partitions on %s", table, column)
+
+
+def create_partition(cr, table: str, column: str, month: date) -> bool:
+    """
+    Create the partition of ``month`` unless it exists, moving the rows of
+    that month out of the default partition first. Returns True if created.
+    """
+    name = partition_name(table, month)
+    cr.execute("SELECT to_regclass(%s)", [name])
+    if cr.fetchone()[0]:
+        return False
+    ident = sql.Identifier
+    lower, upper = month, month_start(month, 1)
+    cr.execute(
+        sql.SQL("CREATE TABLE {} (LIKE {} INCLUDING DEFAULTS INCLUDING STORAGE)").format(
+            ident(name), ident(table)
+        )
+    )
+    cr.execute(
+        sql.SQL(
+            "WITH moved AS (DELETE FROM {} WHERE {} >= %s AND {} < %s RETURNING *)"
+            " INSERT INTO {} SELECT * FROM moved"
+        ).format(ident(f"{table}_pdefault"), ident(column), ident(column), ident(name)),
+        [lower, upper],
+    )
+    cr.execute(
+        sql.SQL("ALTER TABLE {} ATTACH PARTITION {} FOR VALUES FROM (%s) TO (%s)").format(
+            ident(table), ident(name)
+        ),
+        [lower, upper],
+    )
+    return True
+
+
+def detach_partition(cr, table: str, name: str) -> None:
+    """Detach ``name``: its rows leave ``table`` and stay in a standalone table."""
+    cr.execute(
+        sql.SQL("ALTER TABLE {} DETACH PARTITION {}").format(sql.Identifier(table), sql.Identifier(name))
+    )
@@ -10,6 +10,7 @@ from __future__ import annotations
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from datetime import datetime, time, timedelta
 from typing import Dict, Iterable, List, Optional
 
 
@@ -52,14 +53,7 @@ class ProductivityStrategy(ScoreStrategy):
             return engine.weighted_average(prod_list)
 
         # Fallback: logs in the cycle
-        logs = engine.env["med.performance.log"].search(
-            [
-                ("employee_id", "=", employee.id),
-                ("date", ">=", engine.cycle.date_start),
-                ("date", "<=", engine.cycle.date_end),
-            ]
-        )
-        total_val = sum(logs.mapped("metric_value"))
+        total_val = engine.performance_log_total(employee)
         return min(total_val, 10.0)
 
 
@@ -75,15 +69,7 @@ class EconomicStrategy(ScoreStrategy):
     key = "economic"
 
     def compute(self, engine: "ScoreEngine", employee, assignments) -> float:
-        contract = engine.env["hr.contract"].search(
-            [
-                ("employee_id", "=", employee.id),
-                ("state", "in", ["open", "draft"]),
-            ],
-            limit=1,
-            order="date_start desc",
-        )
-        wage = contract.wage if contract else 0.0
+        wage = engine.contract_wage(employee)
         cycle_cost = (wage / 30.0) * engine.cycle_days
 
         monetary_goals = assignments.filtered(lambda a: a.goal_id.target_type == "monetary")
@@ -103,6 +89,46 @@ class EconomicStrategy(ScoreStrategy):
         return score_eco
 
 
+@dataclass
+class CyclePrefetch:
+    """
+    Cycle-wide data loaded in a constant number of grouped queries so the
+    strategies can read per-employee slices instead of querying each time.
+    """
+
+    assignments_by_employee: Dict[int, object]
+    log_totals: Dict[int, float]
+    wages: Dict[int, float]
+
+    @classmethod
+    def load(cls, engine: "ScoreEngine", assignments) -> "CyclePrefetch":
+        # One read for employee_id/goal_id on the whole set, one for the goals.
+        assignments.mapped("goal_id")
+        ids_by_employee: Dict[int, List[int]] = {}
+        for assignment in assignments:
+            ids_by_employee.setdefault(assignment.employee_id.id, []).append(assignment.id)
+        assignments_by_employee = {
+            emp_id: assignments.browse(ids) for emp_id, ids in ids_by_employee.items()
+        }
+        employee_ids = list(assignments_by_employee)
+        return cls(
+            assignments_by_employee,
+            cls.load_log_totals(engine, employee_ids),
+            cls.load_wages(engine, employee_ids),
+        )
+
+    @staticmethod
+    def load_log_totals(engine: "ScoreEngine", employee_ids) -> Dict[int, float]:
+        """Sum of metric_value per employee over the cycle window (one read_group)."""
+        return engine.performance_log_totals(employee_ids)
+
+    @staticmethod
+    def load_wages(engine: "ScoreEngine", employee_ids) -> Dict[int, float]:
+        """Wage of the latest open/draft contract per employee (one search)."""
+        contracts = engine.env["hr.employee"].browse(list(employee_ids))._get_active_contracts()
+        return {employee_id: contract.wage for employee_id, contract in contracts.items()}
+
+
 class ScoreEngine:
     """Aggregates strategies and weights to compute final scores."""
 
@@ -113,6 +139,7 @@ class ScoreEngine:
         weights: ScoreWeights,
         strategies: Iterable[ScoreStrategy],
         logger: Optional[logging.Logger] = None,
+        use_log_rollup: bool = False,
     ):
         self.env = env
         self.cycle = cycle
@@ -120,6 +147,58 @@ class ScoreEngine:
         self.logger = logger or logging.getLogger(__name__)
         self.cycle_days = max((cycle.date_end - cycle.date_start).days + 1, 1)
         self.strategies: Dict[str, ScoreStrategy] = {s.key: s for s in strategies}
+        self.prefetch: Optional[CyclePrefetch] = None
+        self.use_log_rollup = use_log_rollup
+
+    # Data access used by the strategies: served from the prefetch in batch
+    # mode, queried per employee otherwise (same domains in both paths).
+    def performance_log_domain(self, employee_ids) -> list:
+        # Whole days from date_start to date_end included, as cycle_days.
+        return [
+            ("employee_id", "in", list(employee_ids)),
+            ("date", ">=", datetime.combine(self.cycle.date_start, time.min)),
+            ("date", "<", datetime.combine(self.cycle.date_end + timedelta(days=1), time.min)),
+        ]
+
+    def log_rollup_domain(self, employee_ids) -> list:
+        return [
+            ("employee_id", "in", list(employee_ids)),
+            ("day", ">=", self.cycle.date_start),
+            ("day", "<=", self.cycle.date_end),
+        ]
+
+    def performance_log_totals(self, employee_ids) -> Dict[int, float]:
+        """
+        ``{employee_id: sum of metric_value}`` over the cycle window, from
+        the logs themselves or, with ``use_log_rollup``, from the per-day
+        rollup (O(days) instead of O(logs) per employee).
+        """
+        if not employee_ids:
+            return {}
+        if self.use_log_rollup:
+            groups = self.env["med.performance.log.daily"]._read_group(
+                self.log_rollup_domain(employee_ids),
+                groupby=["employee_id"],
+                aggregates=["metric_total:sum"],
+            )
+        else:
+            groups = self.env["med.performance.log"]._read_group(
+                self.performance_log_domain(employee_ids),
+                groupby=["employee_id"],
+                aggregates=["metric_value:sum"],
+            )
+        return {employee.id: total or 0.0 for employee, total in groups}
+
+    def performance_log_total(self, employee) -> float:
+        if self.prefetch is not None:
+            return self.prefetch.log_totals.get(employee.id, 0.0)
+        return self.performance_log_totals([employee.id]).get(employee.id, 0.0)
+
+    def contract_wage(self, employee) -> float:
+        if self.prefetch is not None:
+            return self.prefetch.wages.get(employee.id, 0.0)
+        contract = employee._get_active_contracts().get(employee.id)
+        return contract.wage if contract else 0.0
 
     # Adapter/utility that keeps weighted average reusable and testable
     def weighted_average(self, assignments) -> float:
@@ -147,6 +226,24 @@ class ScoreEngine:
         results["total"] = self._compute_total(results)
         return results
 
+    def compute_batch(self, assignments) -> Dict[int, Dict[str, float]]:
+        """
+        Batch mode: prefetch the cycle data once and score every employee
+        found in ``assignments``. Returns ``{employee_id: breakdown}`` in the
+        order employees first appear in the recordset.
+        """
+        self.prefetch = CyclePrefetch.load(self, assignments)
+        try:
+            employees = assignments.mapped("employee_id")
+            return {
+                employee.id: self.compute_components(
+                    employee, self.prefetch.assignments_by_employee[employee.id]
+                )
+                for employee in employees
+            }
+        finally:
+            self.prefetch = None
+
     def _compute_total(self, results: Dict[str, float]) -> float:
         if not self.weights.total:
             return 0.0
@@ -197,4 +294,24 @@ class ScoreEngineFactory:
             QualityStrategy(),
             EconomicStrategy(),
         ]
-        return ScoreEngine(env, cycle, weights, strategies, logger=logger)
+
+        engine_cls = ScoreEngine
+        if config and config.score_kernel == "numpy":
+            from .vectorized_engine import VectorizedScoreEngine, np
+
+            if np is not None:
+                engine_cls = VectorizedScoreEngine
+            else:
+                (logger or logging.getLogger(__name__)).warning(
+                    "Scoring config %s requests the NumPy kernel but numpy is not installed; "
+                    "using the Python kernel.",
+                    config.name,
+                )
+        return engine_cls(
+            env,
+            cycle,
+            weights,
+            strategies,
+            logger=logger,
+            use_log_rollup=bool(config and config.use_log_rollup),
+        )
@@ -1,8 +1,24 @@
 """
 Lightweight Adapter helpers to serialize Odoo records to JSON-friendly
 structures for the API layer.
+
+``RowEncoder`` compiles a field list once into per-column converters
+(many2one -> {"id", "name"}, date/datetime -> string, float rounding) and
+builds each output row in a single pass, without mutating the
+``search_read`` dicts. ``dumps`` uses orjson when it is installed.
 """
-from typing import Dict
+import json
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+# Same text formats as Odoo's JSON-RPC encoder, so http and json routes agree.
+DATE_FORMAT = "%Y-%m-%d"
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 
 class Many2OneAdapter:
@@ -26,3 +42,119 @@ class RecordSerializer:
         for source, target in mapping.items():
             record[target] = Many2OneAdapter.to_dict(record.pop(source, None))
         return record
+
+    def map_id_name(self, record: Dict, id_field: str, name_field: str, target: str) -> Dict:
+        """
+        Same output as ``map_many2one`` for denormalized rows read with
+        ``load=None``: builds ``{"id", "name"}`` from a raw id and a name column.
+        """
+        record_id = record.pop(id_field, None)
+        name = record.pop(name_field, None)
+        record[target] = {"id": record_id, "name": name} if record_id else None
+        return record
+
+    def to_columnar(self, records: List[Dict], fields: Sequence[str]) -> Dict:
+        """
+        Compact encoding for charts: one array per field instead of one
+        dict per row, e.g. ``{"count": 2, "columns": {"score_total": [8.1, 7.4]}}``.
+        """
+        return {
+            "count": len(records),
+            "columns": {fname: [rec.get(fname) for rec in records] for fname in fields},
+        }
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.strftime(DATETIME_FORMAT)
+    if isinstance(value, date):
+        return value.strftime(DATE_FORMAT)
+    return str(value)
+
+
+def dumps(value) -> bytes:
+    """JSON-encode ``value`` to bytes, with orjson when available."""
+    if orjson is not None:
+        # Datetimes go through _json_default too: same wire format with or without orjson.
+        return orjson.dumps(
+            value,
+            default=_json_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+    return json.dumps(value, default=_json_default, separators=(",", ":")).encode()
+
+
+def _many2one(value):
+    return {"id": value[0], "name": value[1]} if value else None
+
+
+def _datetime(value):
+    return value.strftime(DATETIME_FORMAT) if value else value
+
+
+def _date(value):
+    return value.strftime(DATE_FORMAT) if value else value
+
+
+def _rounder(digits: int) -> Callable:
+    return lambda value: round(value, digits) if value else value
+
+
+class RowEncoder:
+    """
+    Precompiled ``search_read`` row -> JSON-ready dict converter.
+
+    Columns are ``(target_key, source_field, converter_or_None)`` tuples
+    computed once per field list; ``pairs`` maps a target key to an
+    ``(id_field, name_field)`` couple read with ``load=None`` (denormalized
+    tables), producing the same ``{"id", "name"}`` shape as a many2one.
+    """
+
+    _cache: Dict[tuple, "RowEncoder"] = {}
+
+    def __init__(self, columns: Sequence[Tuple[str, str, Optional[Callable]]], pairs=None):
+        self.plain = tuple((target, source) for target, source, conv in columns if conv is None)
+        self.converted = tuple((target, source, conv) for target, source, conv in columns if conv is not None)
+        self.pairs = tuple((target, id_field, name_field) for target, (id_field, name_field) in (pairs or {}).items())
+
+    @classmethod
+    def for_fields(cls, model, fields: Sequence[str], rename: Optional[Dict[str, str]] = None,
+                   pairs: Optional[Dict[str, Tuple[str, str]]] = None) -> "RowEncoder":
+        """Encoder for ``fields`` of ``model``, cached per (model, fields, rename, pairs)."""
+        rename = rename or {}
+        pairs = pairs or {}
+        key = (model._name, tuple(fields), tuple(sorted(rename.items())), tuple(sorted(pairs.items())))
+        encoder = cls._cache.get(key)
+        if encoder is None:
+            paired = {f for couple in pairs.values() for f in couple}
+            columns = []
+            for fname in fields:
+                if fname in paired:
+                    continue
+                field = model._fields.get(fname)
+                conv = None
+                if field is not None:
+                    if field.type == "many2one":
+                        conv = _many2one
+                    elif field.type == "datetime":
+                        conv = _datetime
+                    elif field.type == "date":
+                        conv = _date
+                    elif field.type == "float" and isinstance(field._digits, tuple):
+                        conv = _rounder(field._digits[1])
+                columns.append((rename.get(fname, fname), fname, conv))
+            encoder = cls._cache[key] = cls(columns, pairs)
+        return encoder
+
+    def encode(self, row: Dict) -> Dict:
+        out = {target: row.get(source) for target, source in self.plain}
+        for target, source, conv in self.converted:
+            out[target] = conv(row.get(source))
+        for target, id_field, name_field in self.pairs:
+            record_id = row.get(id_field)
+            out[target] = {"id": record_id, "name": row.get(name_field)} if record_id else None
+        return out
+
+    def encode_many(self, rows: Sequence[Dict]) -> List[Dict]:
+        encode = self.encode
+        return [encode(row) for row in rows]
@@ -0,0 +1,154 @@
+"""
+Vectorized scoring kernel.
+
+Same contract as ``ScoreEngine.compute_batch`` but the four built-in
+strategies are evaluated for every employee at once over columnar NumPy
+arrays (grouped reductions with ``np.bincount``) instead of per-record
+attribute access. NumPy is an optional dependency: the factory only
+selects this kernel when it can be imported.
+
+Only the built-in strategies are vectorized: an engine built with any
+other strategy list (or subclasses of the built-ins) runs the Python
+kernel instead, so custom strategies are never silently dropped.
+"""
+from __future__ import annotations
+
+from typing import Dict
+
+from .score_engine import (
+    CyclePrefetch,
+    EconomicStrategy,
+    GoalsStrategy,
+    ProductivityStrategy,
+    QualityStrategy,
+    ScoreEngine,
+)
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+
+# Integer codes for med.goal.definition.category in the columnar rows.
+CATEGORY_CODES = {"goal": 0, "productivity": 1, "quality": 2}
+
+# Strategies reproduced by the kernel, by key.
+VECTORIZED_STRATEGIES = {
+    "goals": GoalsStrategy,
+    "productivity": ProductivityStrategy,
+    "quality": QualityStrategy,
+    "economic": EconomicStrategy,
+}
+
+
+class VectorizedScoreEngine(ScoreEngine):
+    """ScoreEngine whose batch mode runs on NumPy arrays."""
+
+    def is_vectorizable(self) -> bool:
+        """True when the strategies are exactly the built-ins the kernel reproduces."""
+        return {key: type(s) for key, s in self.strategies.items()} == VECTORIZED_STRATEGIES
+
+    def compute_batch(self, assignments) -> Dict[int, Dict[str, float]]:
+        if not self.is_vectorizable():
+            self.logger.info("Custom scoring strategies: using the Python kernel")
+            return super().compute_batch(assignments)
+        employee_ids = assignments.mapped("employee_id").ids
+        if not employee_ids:
+            return {}
+        size = len(employee_ids)
+        position = {emp_id: i for i, emp_id in enumerate(employee_ids)}
+
+        emp, category, weight, completion, monetary, actual = self._load_columns(assignments, position)
+
+        # Same grouped queries as the prefetch of the Python kernel.
+        totals_by_employee = CyclePrefetch.load_log_totals(self, employee_ids)
+        wages_by_employee = CyclePrefetch.load_wages(self, employee_ids)
+        log_totals = np.array([totals_by_employee.get(e, 0.0) for e in employee_ids], dtype=float)
+        wages = np.array([wages_by_employee.get(e, 0.0) for e in employee_ids], dtype=float)
+
+        score_10 = np.minimum(completion / 10.0, 10.0)
+
+        def weighted_average(code):
+            mask = category == code
+            w = np.where(mask, weight, 0.0)
+            weighted_score = np.bincount(emp, weights=score_10 * w, minlength=size)
+            total_weight = np.bincount(emp, weights=w, minlength=size)
+            present = np.bincount(emp[mask], minlength=size) > 0
+            average = np.divide(
+                weighted_score, total_weight, out=np.zeros(size), where=total_weight != 0
+            )
+            return average, present
+
+        goals, _has_goals = weighted_average(CATEGORY_CODES["goal"])
+
+        prod_avg, has_prod = weighted_average(CATEGORY_CODES["productivity"])
+        productivity = np.where(has_prod, prod_avg, np.minimum(log_totals, 10.0))
+
+        quality_avg, has_quality = weighted_average(CATEGORY_CODES["quality"])
+        quality = np.where(has_quality, quality_avg, 10.0)
+
+        cycle_cost = (wages / 30.0) * self.cycle_days
+        value_generated = np.bincount(emp, weights=np.where(monetary, actual, 0.0), minlength=size)
+        has_cost = cycle_cost > 0
+        roi = np.divide(value_generated - cycle_cost, cycle_cost, out=np.zeros(size), where=has_cost)
+        economic = np.where(
+            has_cost,
+            np.where(roi < 0, np.maximum(0.0, 5.0 + roi * 5.0), np.minimum(10.0, 5.0 + roi * 2.5)),
+            np.where(value_generated > 0, 10.0, 0.0),
+        )
+
+        if self.weights.total:
+            total = (
+                goals * self.weights.goals
+                + productivity * self.weights.productivity
+                + quality * self.weights.quality
+                + economic * self.weights.economic
+            ) / self.weights.total
+        else:
+            total = np.zeros(size)
+
+        self.logger.info(
+            "Vectorized kernel scored %s employees from %s assignments", size, len(emp)
+        )
+        return {
+            emp_id: {
+                "goals": float(goals[i]),
+                "productivity": float(productivity[i]),
+                "quality": float(quality[i]),
+                "economic": float(economic[i]),
+                "total": float(total[i]),
+            }
+            for i, emp_id in enumerate(employee_ids)
+        }
+
+    def _load_columns(self, assignments, position):
+        """One query for the (employee, category, weight, completion_rate,
+        target_type, actual_value) rows of ``assignments``, as arrays."""
+        assignments.flush_recordset(["employee_id", "goal_id", "completion_rate", "actual_value"])
+        self.env["med.goal.definition"].flush_model(["category", "weight", "target_type"])
+        self.env.cr.execute(
+            """
+            SELECT a.employee_id,
+                   g.category,
+                   COALESCE(g.weight, 0.0),
+                   COALESCE(a.completion_rate, 0.0),
+                   g.target_type,
+                   COALESCE(a.actual_value, 0.0)
+              FROM med_goal_assignment a
+              JOIN med_goal_definition g ON g.id = a.goal_id
+             WHERE a.id = ANY(%s)
+          ORDER BY a.id
+            """,
+            [assignments.ids],
+        )
+        rows = self.env.cr.fetchall()
+        emp = np.fromiter((position[r[0]] for r in rows), dtype=np.intp, count=len(rows))
+        category = np.fromiter(
+            (CATEGORY_CODES.get(r[1], -1) for r in rows), dtype=np.int8, count=len(rows)
+        )
+        weight = np.fromiter((r[2] for r in rows), dtype=float, count=len(rows))
+        completion = np.fromiter((r[3] for r in rows), dtype=float, count=len(rows))
+        monetary = np.fromiter((r[4] == "monetary" for r in rows), dtype=bool, count=len(rows))
+        actual = np.fromiter((r[5] for r in rows), dtype=float, count=len(rows))
+        return emp, category, weight, completion, monetary, actual
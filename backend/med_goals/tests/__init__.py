@@ -0,0 +1,14 @@
+from . import test_score_engine
+from . import test_indexes
+from . import test_employee
+from . import test_portal
+from . import test_benchmarks
+from . import test_last_score
+from . import test_leaderboard
+from . import test_api_limits
+from . import test_metrics
+from . import test_log_partitioning
+from . import test_bulk_ingest
+from . import test_log_queue
+from . import test_generate_assignments
+from . import test_pagination
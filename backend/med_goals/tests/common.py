@@ -0,0 +1,152 @@
+from datetime import date, datetime, time, timedelta
+
+from odoo.tests import TransactionCase
+
+
+class MedGoalsDataMixin:
+    """
+    Seed data shared by the med_goals tests: one area and specialty, a goal
+    per scoring path (strategic, productivity, quality, monetary), a scoring
+    configuration weighting every component and an open cycle.
+    """
+
+    @classmethod
+    def _setup_med_goals(cls):
+        env = cls.env
+        cls.company = env.company
+        cls.area = env["med.area"].create({
+            "name": "Emergency",
+            "code": "ER",
+            "company_id": cls.company.id,
+        })
+        cls.specialty = env["med.specialty"].create({
+            "name": "Trauma",
+            "code": "TRA",
+            "area_id": cls.area.id,
+            "company_id": cls.company.id,
+        })
+        cls.goals = env["med.goal.definition"].create([
+            {
+                "name": "Protocol adherence",
+                "code": "GOAL",
+                "category": "goal",
+                "target_type": "percentage",
+                "weight": 2.0,
+                "default_target_value": 100.0,
+                "company_id": cls.company.id,
+            },
+            {
+                "name": "Consultations",
+                "code": "PROD",
+                "category": "productivity",
+                "target_type": "numeric",
+                "weight": 1.0,
+                "default_target_value": 120.0,
+                "company_id": cls.company.id,
+            },
+            {
+                "name": "Patient satisfaction",
+                "code": "QUAL",
+                "category": "quality",
+                "target_type": "percentage",
+                "weight": 1.0,
+                "default_target_value": 95.0,
+                "company_id": cls.company.id,
+            },
+            {
+                "name": "Billed procedures",
+                "code": "REV",
+                "category": "goal",
+                "target_type": "monetary",
+                "weight": 1.5,
+                "default_target_value": 4000.0,
+                "company_id": cls.company.id,
+            },
+        ])
+        cls.config = env["med.scoring.config"].create({
+            "name": "Balanced",
+            "company_id": cls.company.id,
+            "weight_goals": 0.4,
+            "weight_productivity": 0.2,
+            "weight_quality": 0.2,
+            "weight_economic": 0.2,
+        })
+        cls.cycle = cls._create_cycle("2026-Q1", date(2026, 1, 1), date(2026, 3, 31))
+
+    @classmethod
+    def _create_cycle(cls, name, date_start, date_end):
+        cycle = cls.env["med.evaluation.cycle"].create({
+            "name": name,
+            "company_id": cls.company.id,
+            "date_start": date_start,
+            "date_end": date_end,
+            "scoring_config_id": cls.config.id,
+        })
+        cycle.action_open()
+        return cycle
+
+    @classmethod
+    def _create_employees(cls, count, cycle=None, prefix="Employee"):
+        """
+        ``count`` employees assigned to ``cycle`` (the shared open cycle by
+        default). The data varies per employee so every scoring branch is
+        taken: a missing productivity or quality goal, no contract, logs on
+        the last day of the cycle and right after it.
+        """
+        env = cls.env
+        cycle = cycle or cls.cycle
+        employees = env["hr.employee"].create([
+            {
+                "name": f"{prefix} {i:04d}",
+                "company_id": cls.company.id,
+                "med_area_id": cls.area.id,
+                "med_specialty_id": cls.specialty.id,
+            }
+            for i in range(count)
+        ])
+        contract_vals, assignment_vals, log_vals = [], [], []
+        for i, employee in enumerate(employees):
+            if i % 5 != 4:
+                contract_vals.append({
+                    "name": f"Contract {employee.name}",
+                    "employee_id": employee.id,
+                    "wage": 1500.0 + 250.0 * (i % 7),
+                    "date_start": date(2025, 1, 1),
+                    "state": "open",
+                })
+            for j, goal in enumerate(cls.goals):
+                if (i + j) % 4 == 3:
+                    continue
+                assignment_vals.append({
+                    "employee_id": employee.id,
+                    "goal_id": goal.id,
+                    "evaluation_cycle_id": cycle.id,
+                    "company_id": cls.company.id,
+                    "target_value": goal.default_target_value,
+                    "actual_value": goal.default_target_value * ((i * 37 + j * 11) % 150) / 100.0,
+                })
+            if i % 3 == 0:
+                after_cycle = datetime.combine(cycle.date_end + timedelta(days=1), time.min)
+                for moment, value in (
+                    (datetime.combine(cycle.date_start, time(9)), 1.5 + i % 4),
+                    (datetime.combine(cycle.date_end, time(23, 30)), 2.0),
+                    (after_cycle, 50.0),  # first instant after the cycle: never counted
+                ):
+                    log_vals.append({
+                        "name": "Shift",
+                        "employee_id": employee.id,
+                        "company_id": cls.company.id,
+                        "date": moment,
+                        "metric_value": value,
+                    })
+        env["hr.contract"].create(contract_vals)
+        env["med.goal.assignment"].create(assignment_vals)
+        env["med.performance.log"].create(log_vals)
+        return employees
+
+
+class MedGoalsCase(MedGoalsDataMixin, TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._setup_med_goals()
@@ -0,0 +1,63 @@
+import json
+
+from odoo.tests import HttpCase, new_test_user, tagged
+
+from ..controllers.med_goals_api import HISTORY_MAX_LIMIT
+from .common import MedGoalsDataMixin
+
+
+@tagged("post_install", "-at_install")
+class TestApiPageLimits(MedGoalsDataMixin, HttpCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._setup_med_goals()
+        cls.employee = cls._create_employees(1)
+        cls.cycle._compute_scores()
+        new_test_user(
+            cls.env,
+            login="med_limits",
+            groups="base.group_user,med_goals.group_med_goals_user",
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate("med_limits", "med_limits")
+
+    def _call(self, url, **params):
+        response = self.url_open(
+            url,
+            data=json.dumps({"jsonrpc": "2.0", "method": "call", "params": params}),
+            headers={"Content-Type": "application/json"},
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()["result"]
+
+    def test_non_positive_limits_rejected(self):
+        urls = [
+            f"/med_goals/api/employees/{self.employee.id}/scores",
+            "/med_goals/api/performance_logs",
+        ]
+        for url in urls:
+            for limit in (0, -5, "ten"):
+                with self.subTest(url=url, limit=limit):
+                    self.assertEqual(self._call(url, limit=limit)["status"], "error")
+            self.assertEqual(self._call(url, limit=1)["status"], "ok")
+
+    def test_cycle_scores_page_validated(self):
+        url = f"/med_goals/api/evaluation_cycles/{self.cycle.id}/scores"
+        for params in ({"limit": -1}, {"limit": 0}, {"limit": "ten"}, {"offset": -1}, {"offset": "x"}):
+            with self.subTest(**params):
+                self.assertEqual(self._call(url, **params)["status"], "error")
+        result = self._call(url, limit="10", offset=None)
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual(len(result["records"]), 1)
+
+    def test_history_limit_coerced(self):
+        url = f"/med_goals/api/employees/{self.employee.id}"
+        result = self._call(url, history_limit=str(HISTORY_MAX_LIMIT * 10))
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual(len(result["score_history"]), 1)
+        for history_limit in (0, "many"):
+            with self.subTest(history_limit=history_limit):
+                self.assertEqual(self._call(url, history_limit=history_limit)["status"], "error")
@@ -0,0 +1,147 @@
+"""
+Opt-in benchmarks, excluded from the standard test run. Run them with:
+
+    odoo-bin -d <db> -u med_goals --test-tags med_goals_benchmark --stop-after-init
+
+Results are logged as tables; the assertions only check that the measured
+variants produce the same output.
+"""
+import copy
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+from odoo.tests import TransactionCase, tagged
+
+from ..controllers.med_goals_api import PUBLIC_EMPLOYEE_FIELDS, PUBLIC_EMPLOYEE_RENAME
+from ..models.med_evaluation_cycle import PARALLEL_CLOSE_SHARD_SIZE
+from ..services.parallel_scoring import score_shards_in_parallel
+from ..services.serializers import RecordSerializer, RowEncoder, _json_default, dumps
+
+_logger = logging.getLogger(__name__)
+
+# Smallest cycle worth timing on a process pool.
+PARALLEL_BENCH_MIN_EMPLOYEES = 1000
+
+ENCODER_BENCH_ROWS = 10000
+ENCODER_BENCH_REPEAT = 5
+
+
+@tagged("med_goals_benchmark", "-standard", "post_install", "-at_install")
+class BenchmarkParallelClose(TransactionCase):
+    """
+    Wall-clock scaling of the batch close scoring by worker count. Pool
+    workers open their own cursors and only see committed data, so this
+    reads the largest cycle already in the database (use a restored copy
+    of production). Nothing is written.
+    """
+
+    def test_scaling_by_workers(self):
+        self.env.cr.execute(
+            """
+            SELECT evaluation_cycle_id, count(DISTINCT employee_id) AS employees
+              FROM med_goal_assignment
+             WHERE state != 'cancelled'
+          GROUP BY evaluation_cycle_id
+          ORDER BY employees DESC
+             LIMIT 1
+            """
+        )
+        row = self.env.cr.fetchone()
+        if not row or row[1] < PARALLEL_BENCH_MIN_EMPLOYEES:
+            self.skipTest(f"needs a committed cycle with {PARALLEL_BENCH_MIN_EMPLOYEES}+ employees")
+        cycle = self.env["med.evaluation.cycle"].browse(row[0])
+        ICP = self.env["ir.config_parameter"].sudo()
+        shard_size = int(ICP.get_param("med_goals.parallel_close_shard_size", PARALLEL_CLOSE_SHARD_SIZE))
+        shards = [(cycle.id, employee_ids) for employee_ids in cycle._employee_shards(shard_size)]
+
+        started = time.perf_counter()
+        expected = cycle._compute_breakdowns()
+        sequential = time.perf_counter() - started
+        lines = [f"{'sequential':>10} {sequential:9.2f}s {1.0:7.2f}x"]
+
+        cores = os.cpu_count() or 1
+        for workers in sorted(({w for w in (2, 4, 8, 16, 32) if w <= cores} | {cores}) - {1}):
+            started = time.perf_counter()
+            merged = score_shards_in_parallel(self.env, shards, workers)
+            elapsed = time.perf_counter() - started
+            lines.append(f"{workers:>10} {elapsed:9.2f}s {sequential / elapsed:7.2f}x")
+
+            actual = merged.get(cycle.id, {})
+            self.assertEqual(set(actual), set(expected))
+            for employee_id, breakdown in expected.items():
+                for key, value in breakdown.items():
+                    self.assertAlmostEqual(actual[employee_id][key], value, delta=1e-9)
+
+        _logger.info(
+            "Parallel close of cycle %s (%s employees, %s shards, %s cores):\n%10s %10s %8s\n%s",
+            cycle.name, row[1], len(shards), cores, "workers", "wall", "speedup", "\n".join(lines),
+        )
+
+
+@tagged("med_goals_benchmark", "-standard", "post_install", "-at_install")
+class BenchmarkRowEncoder(TransactionCase):
+    """
+    10k public employee rows: precompiled RowEncoder + dumps against the
+    previous per-row map_many2one + json.dumps. Best of several runs; the
+    rows are synthetic, so no database access is timed.
+    """
+
+    def _rows(self):
+        start = datetime(2026, 1, 1, 8, 0)
+        return [
+            {
+                "id": i,
+                "name": f"Employee {i:05d}",
+                "job_title": "Nurse" if i % 2 else "Surgeon",
+                "work_email": f"employee{i}@example.com",
+                "work_phone": False,
+                "med_area_id": (i % 12 + 1, f"Area {i % 12}"),
+                "med_specialty_id": (i % 40 + 1, f"Specialty {i % 40}") if i % 9 else False,
+                "last_score": round((i * 7919 % 1000) / 100.0, 2),
+                "last_evaluation_date": start + timedelta(minutes=i),
+                "is_top_performer": i % 50 == 0,
+                "rank_area": i % 30 + 1,
+                "rank_specialty": i % 10 + 1,
+            }
+            for i in range(ENCODER_BENCH_ROWS)
+        ]
+
+    def _best_of(self, func, rows):
+        timings, output = [], None
+        for _i in range(ENCODER_BENCH_REPEAT):
+            batch = copy.deepcopy(rows)  # the legacy path pops keys in place
+            started = time.perf_counter()
+            output = func(batch)
+            timings.append(time.perf_counter() - started)
+        return min(timings), output
+
+    def test_encoder_against_legacy(self):
+        Employee = self.env["hr.employee"]
+        serializer = RecordSerializer()
+        rows = self._rows()
+
+        def legacy(batch):
+            for row in batch:
+                row.pop("id")
+                serializer.map_many2one(row, PUBLIC_EMPLOYEE_RENAME)
+            return json.dumps(batch, default=_json_default).encode()
+
+        def encoder(batch):
+            encode = RowEncoder.for_fields(Employee, PUBLIC_EMPLOYEE_FIELDS, rename=PUBLIC_EMPLOYEE_RENAME)
+            return dumps(encode.encode_many(batch))
+
+        legacy_time, legacy_out = self._best_of(legacy, rows)
+        encoder_time, encoder_out = self._best_of(encoder, rows)
+        self.assertEqual(json.loads(encoder_out), json.loads(legacy_out))
+
+        _logger.info(
+            "Encoding %s employee rows (best of %s):\n"
+            "  map_many2one + json.dumps %8.1f ms %9s bytes\n"
+            "  RowEncoder + dumps        %8.1f ms %9s bytes (%.2fx)",
+            ENCODER_BENCH_ROWS, ENCODER_BENCH_REPEAT,
+            legacy_time * 1000, len(legacy_out),
+            encoder_time * 1000, len(encoder_out), legacy_time / encoder_time,
+        )
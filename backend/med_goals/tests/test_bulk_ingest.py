@@ -0,0 +1,86 @@
+from unittest.mock import patch
+
+from odoo.exceptions import ValidationError
+from odoo.tests import tagged
+
+from .common import MedGoalsCase
+
+
+@tagged("post_install", "-at_install")
+class TestBulkIngest(MedGoalsCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.employees = cls._create_employees(2)
+        cls.assignment = cls.env["med.goal.assignment"].search([
+            ("employee_id", "=", cls.employees[0].id),
+            ("evaluation_cycle_id", "=", cls.cycle.id),
+        ], limit=1)
+
+    def _ingest(self, *rows, **kwargs):
+        return self.env["med.performance.log"]._bulk_ingest(list(rows), **kwargs)
+
+    def _row(self, **vals):
+        return {"name": "Shift", "employee_id": self.employees[0].id, "metric_value": 1.0, **vals}
+
+    def test_assignment_sets_employee_and_company(self):
+        [result] = self._ingest({"name": "Shift", "assignment_id": self.assignment.id})
+        self.assertEqual(result["status"], "created", result)
+        log = self.env["med.performance.log"].browse(result["id"])
+        self.assertEqual(log.employee_id, self.assignment.employee_id)
+        self.assertEqual(log.company_id, self.assignment.company_id)
+
+    def test_stored_key_is_duplicate(self):
+        [first] = self._ingest(self._row(idempotency_key="shift-1"))
+        self.assertEqual(first["status"], "created")
+        [again] = self._ingest(self._row(idempotency_key="shift-1", metric_value=9.0))
+        self.assertEqual(again["status"], "duplicate")
+        self.assertEqual(again["id"], first["id"])
+        self.assertEqual(self.env["med.performance.log"].browse(first["id"]).metric_value, 1.0)
+
+    def test_key_repeated_in_batch(self):
+        results = self._ingest(self._row(idempotency_key="shift-2"), self._row(idempotency_key="shift-2"))
+        self.assertEqual([r["status"] for r in results], ["created", "duplicate"])
+        self.assertEqual(results[1]["id"], results[0]["id"])
+
+    def test_assignment_of_another_employee(self):
+        [result] = self._ingest(self._row(employee_id=self.employees[1].id, assignment_id=self.assignment.id))
+        self.assertEqual(result["status"], "error")
+        self.assertIn("another employee", result["message"])
+
+    def test_invalid_metric_value(self):
+        results = self._ingest(
+            self._row(metric_value=-1.0), self._row(metric_value="12"), self._row(metric_value=True),
+        )
+        self.assertEqual([r["status"] for r in results], ["error"] * 3)
+        self.assertIn("negative", results[0]["message"])
+        self.assertIn("number", results[1]["message"])
+
+    def test_invalid_date(self):
+        results = self._ingest(self._row(date="not a date"), self._row(date="2026-02-10 08:00:00"))
+        self.assertEqual(results[0]["status"], "error")
+        self.assertEqual(results[0]["message"], "Invalid date.")
+        self.assertEqual(results[1]["status"], "created")
+
+    def test_failed_chunk_retried_row_by_row(self):
+        Log = type(self.env["med.performance.log"])
+        mark_dirty = Log._mark_scores_dirty
+        batch_sizes = []
+
+        def failing_mark_dirty(records):
+            batch_sizes.append(len(records))
+            if "Broken" in records.mapped("name"):
+                raise ValidationError("Broken row")
+            return mark_dirty(records)
+
+        rows = [self._row(name="Shift A"), self._row(name="Broken"), self._row(name="Shift B")]
+        with patch.object(Log, "_mark_scores_dirty", failing_mark_dirty):
+            results = self._ingest(*rows, chunk_size=3)
+
+        self.assertEqual(batch_sizes, [3, 1, 1, 1])
+        self.assertEqual([r["status"] for r in results], ["created", "error", "created"])
+        self.assertEqual(results[1]["message"], "Broken row")
+        self.assertEqual(
+            self.env["med.performance.log"].browse([results[0]["id"], results[2]["id"]]).mapped("name"),
+            ["Shift A", "Shift B"],
+        )
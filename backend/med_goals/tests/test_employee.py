@@ -0,0 +1,50 @@
+from odoo.tests import tagged
+
+from .common import MedGoalsCase
+
+
+@tagged("post_install", "-at_install")
+class TestEmployeeContracts(MedGoalsCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.employees = cls._create_employees(30)
+
+    def _fresh(self, employees):
+        """Same records with their own prefetch set, and an empty cache."""
+        self.env.invalidate_all()
+        return self.env["hr.employee"].browse(employees.ids)
+
+    def _query_count(self, func, employees):
+        self.env.flush_all()
+        employees = self._fresh(employees)
+        count = self.env.cr.sql_log_count
+        func(employees)
+        return self.env.cr.sql_log_count - count
+
+    def test_current_wage(self):
+        wages = self._fresh(self.employees).mapped("current_wage")
+        self.assertEqual(wages, [
+            0.0 if i % 5 == 4 else 1500.0 + 250.0 * (i % 7) for i in range(len(self.employees))
+        ])
+
+    def test_current_wage_query_count(self):
+        def read_wage(employees):
+            employees.mapped("current_wage")
+
+        read_wage(self._fresh(self.employees))  # warm up the ormcaches
+        single = self._query_count(read_wage, self.employees[:1])
+        many = self._fresh(self.employees)
+        with self.assertQueryCount(single):
+            read_wage(many)
+
+    def test_active_contracts_query_count(self):
+        def read_contracts(employees):
+            for contract in employees._get_active_contracts().values():
+                contract.wage
+
+        read_contracts(self._fresh(self.employees))
+        single = self._query_count(read_contracts, self.employees[:1])
+        many = self._fresh(self.employees)
+        with self.assertQueryCount(single):
+            read_contracts(many)
@@ -0,0 +1,87 @@
+from datetime import date
+
+from odoo.tests import tagged
+
+from .common import MedGoalsCase
+
+
+@tagged("post_install", "-at_install")
+class TestGenerateAssignments(MedGoalsCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        env = cls.env
+        cls.icu = env["med.area"].create({"name": "ICU", "code": "ICU", "company_id": cls.company.id})
+        cls.cardiac = env["med.specialty"].create({
+            "name": "Cardiac",
+            "code": "CAR",
+            "area_id": cls.icu.id,
+            "company_id": cls.company.id,
+        })
+        cls.er_employee, cls.icu_employee, cls.floating_employee = env["hr.employee"].create([
+            {"name": "ER nurse", "med_area_id": cls.area.id, "med_specialty_id": cls.specialty.id},
+            {"name": "ICU nurse", "med_area_id": cls.icu.id, "med_specialty_id": cls.cardiac.id},
+            {"name": "Floating nurse"},
+        ])
+        cls.employees = cls.er_employee + cls.icu_employee + cls.floating_employee
+
+        def goal(code, area=None, specialty=None, target=10.0):
+            return {
+                "name": code,
+                "code": code,
+                "category": "goal",
+                "target_type": "numeric",
+                "weight": 1.0,
+                "default_target_value": target,
+                "area_id": area.id if area else False,
+                "specialty_id": specialty.id if specialty else False,
+                "company_id": cls.company.id,
+            }
+
+        cls.er_goal, cls.trauma_goal, cls.cardiac_goal, cls.untargeted_goal = env["med.goal.definition"].create([
+            goal("ER-ONLY", area=cls.area),
+            goal("TRAUMA", area=cls.area, specialty=cls.specialty),
+            goal("CARDIAC", area=cls.icu, specialty=cls.cardiac),
+            goal("NO-TARGET", target=0.0),
+        ])
+        cls.all_goals = cls.goals + cls.er_goal + cls.trauma_goal + cls.cardiac_goal + cls.untargeted_goal
+        cls.new_cycle = cls._create_cycle("2026-Q2", date(2026, 4, 1), date(2026, 6, 30))
+
+    def _pairs(self, cycle):
+        assignments = self.env["med.goal.assignment"].search([("evaluation_cycle_id", "=", cycle.id)])
+        return {(a.employee_id, a.goal_id) for a in assignments}
+
+    def test_scope_matching(self):
+        self.new_cycle.action_generate_assignments(employees=self.employees, goals=self.all_goals)
+        expected = {
+            self.er_employee: self.goals + self.er_goal + self.trauma_goal,
+            self.icu_employee: self.goals + self.cardiac_goal,
+            self.floating_employee: self.goals,
+        }
+        self.assertEqual(
+            self._pairs(self.new_cycle),
+            {(employee, goal) for employee, goals in expected.items() for goal in goals},
+        )
+
+    def test_existing_pairs_and_untargeted_goals_skipped(self):
+        existing = self.env["med.goal.assignment"].create({
+            "employee_id": self.er_employee.id,
+            "goal_id": self.er_goal.id,
+            "evaluation_cycle_id": self.new_cycle.id,
+            "company_id": self.company.id,
+            "target_value": 42.0,
+        })
+        self.new_cycle.action_generate_assignments(employees=self.er_employee, goals=self.all_goals)
+        self.new_cycle.action_generate_assignments(employees=self.er_employee, goals=self.all_goals)
+
+        assignments = self.env["med.goal.assignment"].search([("evaluation_cycle_id", "=", self.new_cycle.id)])
+        self.assertEqual(len(assignments), len(self.goals) + 2, "one assignment per matching goal, no repeats")
+        self.assertIn(existing, assignments)
+        self.assertEqual(existing.target_value, 42.0)
+        self.assertNotIn(self.untargeted_goal, assignments.goal_id)
+
+    def test_empty_selection_seeds_nothing(self):
+        Employee, Goal = self.env["hr.employee"], self.env["med.goal.definition"]
+        self.new_cycle.action_generate_assignments(employees=Employee, goals=self.all_goals)
+        self.new_cycle.action_generate_assignments(employees=self.employees, goals=Goal)
+        self.assertFalse(self._pairs(self.new_cycle))
@@ -0,0 +1,89 @@
+from odoo.tests import tagged
+from odoo.tools import SQL
+
+from ..services.score_engine import ScoreEngineFactory
+from .common import MedGoalsCase
+
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+
+@tagged("post_install", "-at_install")
+class TestHotPathIndexes(MedGoalsCase):
+    """
+    EXPLAIN regression test: the queries of the hot paths, as generated by
+    the ORM, must be answered by the composite indexes created in init().
+    Sequential scans are disabled so the tiny test tables do not hide a
+    missing or unusable index behind a cheaper seq scan.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.employees = cls._create_employees(12)
+        cls.cycle._compute_scores()
+
+    def setUp(self):
+        super().setUp()
+        self.env.flush_all()
+        self.env.cr.execute("SET LOCAL enable_seqscan = off")
+        self.addCleanup(self.env.cr.execute, "SET LOCAL enable_seqscan = on")
+
+    def assertUsesIndex(self, model_name, domain, index_name, order=None, limit=None):
+        Model = self.env[model_name]
+        query = Model._search(domain, order=order, limit=limit)
+        self.env.cr.execute(SQL("EXPLAIN (FORMAT JSON) %s", query.select()))
+        plan = self.env.cr.fetchone()[0][0]["Plan"]
+        nodes = list(_plan_nodes(plan))
+        self.assertIn(index_name, {node.get("Index Name") for node in nodes}, plan)
+        seq_scanned = {node.get("Relation Name") for node in nodes if node["Node Type"] == "Seq Scan"}
+        self.assertNotIn(Model._table, seq_scanned, plan)
+
+    def test_scoreboard(self):
+        self.assertUsesIndex(
+            "med.employee.score", [("cycle_id", "=", self.cycle.id)],
+            "med_employee_score_cycle_total_idx", order="score_total desc, id", limit=50,
+        )
+        self.assertUsesIndex(
+            "med.leaderboard", [("cycle_id", "=", self.cycle.id)],
+            "med_leaderboard_cycle_total_idx", order="score_total desc, id", limit=50,
+        )
+
+    def test_score_history(self):
+        self.assertUsesIndex(
+            "med.employee.score", [("employee_id", "=", self.employees[0].id)],
+            "med_employee_score_employee_create_idx", order="create_date desc, id desc", limit=5,
+        )
+
+    def test_productivity_log_window(self):
+        engine = ScoreEngineFactory.from_cycle(self.env, self.cycle)
+        self.assertUsesIndex(
+            "med.performance.log", engine.performance_log_domain(self.employees.ids),
+            "med_performance_log_employee_date_idx",
+        )
+
+    def test_cycle_assignment_slice(self):
+        self.assertUsesIndex(
+            "med.goal.assignment",
+            [("evaluation_cycle_id", "=", self.cycle.id), ("employee_id", "in", self.employees[:3].ids)],
+            "med_goal_assignment_cycle_employee_idx",
+        )
+
+    def test_single_column_indexes_dropped(self):
+        # Leading columns of the composites: no separate index to maintain.
+        self.env.cr.execute(
+            """
+            SELECT indexname FROM pg_indexes
+             WHERE indexname = ANY(%s)
+            """,
+            [[
+                "med_performance_log_employee_id_index",
+                "med_employee_score_employee_id_index",
+                "med_employee_score_cycle_id_index",
+                "med_goal_assignment_evaluation_cycle_id_index",
+            ]],
+        )
+        self.assertEqual(self.env.cr.fetchall(), [])
@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from .common import MedGoalsCase
+
+
+@tagged("post_install", "-at_install")
+class TestLastScorePointer(MedGoalsCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.employees = cls._create_employees(15)
+
+    def test_refreshed_once_per_close(self):
+        Employee = type(self.env["hr.employee"])
+        refresh = Employee._refresh_last_score
+        calls = []
+
+        def spy(records):
+            calls.append(set(records.ids))
+            return refresh(records)
+
+        with patch.object(Employee, "_refresh_last_score", spy):
+            self.cycle.action_close()
+            # Whatever was queued has been flushed by the ranking pass.
+            self.env.cr.precommit.run()
+
+        self.assertEqual(len(calls), 1, "one bulk refresh per close")
+        self.assertLessEqual(set(self.employees.ids), calls[0])
+
+        scores = self.env["med.employee.score"].search([("cycle_id", "=", self.cycle.id)])
+        self.assertEqual(len(scores), len(self.employees))
+        for score in scores:
+            employee = score.employee_id
+            self.assertEqual(employee.last_score_id, score)
+            self.assertAlmostEqual(employee.last_score, round(score.score_total, 2))
+            self.assertEqual(employee.rank_area, score.rank_area)
+            self.assertEqual(employee.is_top_performer, score.is_top_performer)
+
+    def test_pointer_follows_manual_edit(self):
+        self.cycle.action_close()
+        score = self.env["med.employee.score"].search([("cycle_id", "=", self.cycle.id)], limit=1)
+        score.score_total = 9.87
+        self.env.cr.precommit.run()
+        self.assertAlmostEqual(score.employee_id.last_score, 9.87)
+
+    def test_pointer_refresh_moves_write_date(self):
+        """The public employee list derives its ETag from hr_employee.write_date."""
+        self.cycle.action_close()
+        self.env.flush_all()
+        employee = self.employees[0]
+        self.env.cr.execute(
+            "UPDATE hr_employee SET write_date = timestamp '2020-01-01' WHERE id = %s", [employee.id]
+        )
+        employee.invalidate_recordset(["write_date"])
+
+        employee.last_score_id.unlink()
+        self.env.cr.precommit.run()
+        self.assertFalse(employee.last_score_id)
+        self.assertGreater(employee.write_date.year, 2020)
@@ -0,0 +1,111 @@
+from datetime import date
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from .common import MedGoalsCase
+
+
+@tagged("post_install", "-at_install")
+class TestLeaderboardRefresh(MedGoalsCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.employees = cls._create_employees(8)
+        cls.cycle.action_close()
+
+    def _board(self, cycle):
+        self.env.cr.precommit.run()
+        rows = self.env["med.leaderboard"].search([("cycle_id", "=", cycle.id)])
+        return {row.employee_id: row for row in rows}
+
+    def _older_closed_cycle(self, employee):
+        """A closed cycle before the current one, scored for ``employee`` only."""
+        older = self._create_cycle("2025-Q3", date(2025, 7, 1), date(2025, 9, 30))
+        self.env["med.employee.score"].create({
+            "employee_id": employee.id,
+            "cycle_id": older.id,
+            "company_id": self.company.id,
+            "score_total": 5.0,
+        })
+        older.state = "closed"
+        self.env.cr.precommit.run()  # builds its board
+        return older
+
+    def test_manual_score_edit_reranks(self):
+        scores = self.env["med.employee.score"].search([("cycle_id", "=", self.cycle.id)], order="score_total, id")
+        last, others = scores[0], scores[1:]
+        # The range tops out at 10.0: make it the only score there.
+        others.filtered(lambda s: s.score_total >= 9.5).write({"score_total": 9.5})
+        self._board(self.cycle)
+        self.assertGreater(last.rank_global, 1)
+
+        last.score_total = 10.0
+        board = self._board(self.cycle)
+        self.assertEqual(last.rank_global, 1)
+        self.assertTrue(last.is_top_performer)
+        self.assertEqual(board[last.employee_id].score_total, 10.0)
+        self.assertEqual(board[last.employee_id].rank_global, 1)
+        self.assertTrue(all(board[s.employee_id].rank_global > 1 for s in others))
+
+        employee = last.employee_id
+        last.unlink()
+        self.assertNotIn(employee, self._board(self.cycle))
+
+    def test_rename_patches_every_board(self):
+        employee = self.employees[0]
+        older = self._older_closed_cycle(employee)
+
+        employee.name = "Renamed Employee"
+        self.assertEqual(self._board(self.cycle)[employee].employee_name, "Renamed Employee")
+        self.assertEqual(self._board(older)[employee].employee_name, "Renamed Employee")
+
+    def test_area_move_skips_older_closed_boards(self):
+        employee = self.employees[0]
+        older = self._older_closed_cycle(employee)
+
+        area = self.env["med.area"].create({
+            "name": "Moved Area",
+            "code": "MV",
+            "company_id": self.company.id,
+        })
+        employee.med_area_id = area
+        self.assertEqual(self._board(self.cycle)[employee].area_id, area)
+        self.assertNotEqual(self._board(older)[employee].area_id, area)
+
+
+@tagged("post_install", "-at_install")
+class TestLeaderboardLiveScoring(MedGoalsCase):
+    BOARD_FIELDS = [
+        "employee_id", "employee_name", "area_id", "specialty_id",
+        "score_total", "rank_global", "rank_area", "rank_specialty", "is_top_performer",
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.employees = cls._create_employees(12)
+        cls.cycle._compute_scores()
+
+    def _snapshot(self):
+        return sorted(
+            self.env["med.leaderboard"].search_read([("cycle_id", "=", self.cycle.id)], self.BOARD_FIELDS),
+            key=lambda row: row["id"],
+        )
+
+    def test_chunks_patch_rows_instead_of_rebuilding(self):
+        assignments = self.env["med.goal.assignment"].search([
+            ("evaluation_cycle_id", "=", self.cycle.id),
+            ("employee_id", "in", self.employees[:3].ids),
+        ])
+        assignments.write({"actual_value": 0.0})
+        self.env["ir.config_parameter"].sudo().set_param("med_goals.live_scoring_chunk_size", 2)
+
+        Leaderboard = type(self.env["med.leaderboard"])
+        with patch.object(Leaderboard, "_refresh") as refresh:
+            self.env["med.evaluation.cycle"]._cron_live_scoring()
+        refresh.assert_not_called()
+
+        patched = self._snapshot()
+        self.env["med.leaderboard"]._refresh(self.cycle.ids)
+        self.assertEqual(patched, self._snapshot())
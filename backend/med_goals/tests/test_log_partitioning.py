@@ -0,0 +1,98 @@
+from datetime import datetime, time, timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+
+from ..services import partitioning
+from .common import MedGoalsCase
+
+
+@tagged("post_install", "-at_install")
+class TestLogPartitioning(MedGoalsCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.employees = cls._create_employees(6)
+        cls.employee = cls.employees[1]  # no logs from the shared seed data
+        cls.today = fields.Date.today()
+        cls.old_day = partitioning.month_start(cls.today, -30) + timedelta(days=14)
+        cls.kept_day = partitioning.month_start(cls.today, -1) + timedelta(days=9)
+        cls.old_log, cls.kept_log = cls._log(cls.old_day, 4.0) + cls._log(cls.kept_day, 3.0)
+        cls.env["ir.config_parameter"].sudo().set_param("med_goals.log_partitioning", "True")
+
+    @classmethod
+    def _log(cls, day, value):
+        return cls.env["med.performance.log"].create({
+            "name": "Shift",
+            "employee_id": cls.employee.id,
+            "company_id": cls.company.id,
+            "date": datetime.combine(day, time(10)),
+            "metric_value": value,
+        })
+
+    @property
+    def table(self):
+        return self.env["med.performance.log"]._table
+
+    def _run_cron(self, **params):
+        ICP = self.env["ir.config_parameter"].sudo()
+        for key, value in params.items():
+            ICP.set_param(f"med_goals.{key}", value)
+        self.env["med.performance.log"]._cron_manage_partitions()
+
+    def _partition_of(self, log):
+        log.flush_recordset()
+        self.env.cr.execute(f"SELECT tableoid::regclass::text FROM {self.table} WHERE id = %s", [log.id])
+        return self.env.cr.fetchone()[0]
+
+    def _daily_total(self, day):
+        rows = self.env["med.performance.log.daily"].search_read(
+            [("employee_id", "=", self.employee.id), ("day", "=", day)], ["metric_total"],
+        )
+        return rows[0]["metric_total"] if rows else None
+
+    def test_conversion_keeps_rows_and_sequence(self):
+        cr = self.env.cr
+        self.env["med.performance.log"].flush_model()
+        cr.execute(f"SELECT count(*), max(id), pg_get_serial_sequence('{self.table}', 'id') FROM {self.table}")
+        count, max_id, sequence = cr.fetchone()
+
+        self._run_cron()
+        self.assertTrue(partitioning.is_partitioned(cr, self.table))
+        cr.execute(f"SELECT count(*), pg_get_serial_sequence('{self.table}', 'id') FROM {self.table}")
+        self.assertEqual(cr.fetchone(), (count, sequence))
+        self.assertEqual(
+            self._partition_of(self.kept_log),
+            partitioning.partition_name(self.table, partitioning.month_start(self.kept_day)),
+        )
+
+        new_log = self._log(self.today, 1.0)
+        self.assertGreater(new_log.id, max_id)
+        cr.execute(f"SELECT last_value FROM {sequence}")
+        self.assertEqual(cr.fetchone()[0], new_log.id)
+
+    def test_default_partition_rows_move(self):
+        self._run_cron()
+        far_month = partitioning.month_start(self.today, 12)
+        far_log = self._log(far_month + timedelta(days=4), 2.0)
+        self.assertEqual(self._partition_of(far_log), f"{self.table}_pdefault")
+
+        self._run_cron(log_partition_months_ahead=12)
+        self.assertEqual(self._partition_of(far_log), partitioning.partition_name(self.table, far_month))
+        self.assertTrue(far_log.exists())
+
+    def test_retention_detaches_old_months(self):
+        self._run_cron()
+        old_partition = partitioning.partition_name(self.table, partitioning.month_start(self.old_day))
+        self.assertEqual(self._daily_total(self.old_day), 4.0)
+
+        self._run_cron(log_retention_months=24)
+        partitions = [name for name, _month in partitioning.list_partitions(self.env.cr, self.table)]
+        self.assertNotIn(old_partition, partitions)
+        self.env.cr.execute(f"SELECT count(*) FROM {old_partition} WHERE id = %s", [self.old_log.id])
+        self.assertEqual(self.env.cr.fetchone()[0], 1, "the detached month stays as a table")
+        self.assertFalse(self.old_log.exists())
+
+        # The rollup forgets the detached days and keeps the others.
+        self.assertIsNone(self._daily_total(self.old_day))
+        self.assertEqual(self._daily_total(self.kept_day), 3.0)
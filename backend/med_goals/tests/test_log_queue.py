@@ -0,0 +1,64 @@
+from odoo.tests import new_test_user, tagged
+
+from ..models.med_performance_log_queue import LogQueueFull
+from .common import MedGoalsCase
+
+
+@tagged("post_install", "-at_install")
+class TestLogQueue(MedGoalsCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.employee = cls._create_employees(1)
+        cls.producers = [
+            new_test_user(cls.env, login=login, groups="base.group_user,med_goals.group_med_goals_user")
+            for login in ("med_producer_a", "med_producer_b")
+        ]
+        cls.Queue = cls.env["med.performance.log.queue"]
+
+    def _set_params(self, **params):
+        ICP = self.env["ir.config_parameter"].sudo()
+        for key, value in params.items():
+            ICP.set_param(f"med_goals.log_queue_{key}", value)
+
+    def _row(self, key, **vals):
+        return {"name": "Shift", "employee_id": self.employee.id, "metric_value": 1.0, "idempotency_key": key, **vals}
+
+    def _queued(self):
+        return self.Queue.search([])
+
+    def test_full_queue_refuses_producers(self):
+        self._set_params(max_depth=3)
+        self.assertEqual(self.Queue._enqueue([self._row("a"), self._row("b")]), 2)
+        with self.assertRaises(LogQueueFull):
+            self.Queue._enqueue([self._row("c"), self._row("d")])
+        self.assertEqual(len(self._queued()), 2)
+        self.assertEqual(self.Queue._enqueue([self._row("c")]), 1)
+
+    def test_drain_keeps_failed_rows(self):
+        self._set_params(flush_size=2)
+        self.Queue._enqueue([self._row("ok-1"), self._row("bad", metric_value=-5.0), self._row("ok-2")])
+        self.Queue._cron_drain()
+
+        logs = self.env["med.performance.log"].search([("idempotency_key", "in", ["ok-1", "ok-2", "bad"])])
+        self.assertEqual(sorted(logs.mapped("idempotency_key")), ["ok-1", "ok-2"])
+        failed = self._queued()
+        self.assertEqual(len(failed), 1)
+        self.assertEqual(failed.state, "failed")
+        self.assertEqual(failed.payload["idempotency_key"], "bad")
+        self.assertIn("negative", failed.error)
+
+        # Failed rows are not claimed again.
+        self.Queue._cron_drain()
+        self.assertEqual(self._queued(), failed)
+
+    def test_drain_attributes_logs_to_producers(self):
+        for user in self.producers:
+            self.Queue.with_user(user).sudo()._enqueue([self._row(f"from-{user.login}")])
+        self.assertEqual(self._queued().mapped("user_id"), self.env["res.users"].concat(*self.producers))
+
+        self.Queue._cron_drain()
+        self.assertFalse(self._queued())
+        for user in self.producers:
+            log = self.env["med.performance.log"].search([("idempotency_key", "=", f"from-{user.login}")])
+            self.assertEqual(log.create_uid, user)
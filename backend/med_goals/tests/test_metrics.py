@@ -0,0 +1,21 @@
+from odoo.tests import HttpCase, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestMetricsEndpoint(HttpCase):
+    def setUp(self):
+        super().setUp()
+        self.env["ir.config_parameter"].sudo().set_param("med_goals.metrics_token", "s3cret")
+
+    def _metrics(self, authorization):
+        return self.url_open("/med_goals/api/_metrics", headers={"Authorization": authorization})
+
+    def test_bearer_token(self):
+        response = self._metrics("Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("text/plain", response.headers["Content-Type"])
+
+    def test_wrong_or_non_ascii_token_forbidden(self):
+        for authorization in ("Bearer nope", "Bearer s3crét", "Basic s3cret"):
+            with self.subTest(authorization=authorization):
+                self.assertEqual(self._metrics(authorization).status_code, 403)
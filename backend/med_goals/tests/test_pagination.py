@@ -0,0 +1,68 @@
+from odoo.tests import tagged
+
+from ..controllers.med_goals_api import FEED_KEYS, SCORE_HISTORY_KEYS, SCORE_KEYS
+from ..services.pagination import keyset_page
+from .common import MedGoalsCase
+
+
+@tagged("post_install", "-at_install")
+class TestKeysetPagination(MedGoalsCase):
+    """Walk three pages forward, then back, on every cursor ordering the API uses."""
+
+    PAGE_SIZE = 3
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.employees = cls._create_employees(8)
+        cls.cycle._compute_scores()
+        cls.env.flush_all()
+        # Ties on the leading key, including sub-second timestamps, so the
+        # id tie-breaker and the microseconds in the cursors are exercised.
+        cls.env.cr.execute(
+            """
+            UPDATE med_employee_score
+               SET create_date = timestamp '2026-02-01 10:00:00.250000' + (id %% 3) * interval '1 day'
+             WHERE cycle_id = %s
+            """,
+            [cls.cycle.id],
+        )
+        cls.env.cr.execute(
+            "UPDATE med_leaderboard SET score_total = (id %% 3)::float8 WHERE cycle_id = %s",
+            [cls.cycle.id],
+        )
+        cls.env.invalidate_all()
+
+    def _walk(self, model, keys):
+        domain = [("cycle_id", "=", self.cycle.id)]
+        order = ", ".join(f"{fname} {direction}" for fname, direction in keys)
+        expected = model.search(domain, order=order).ids
+        self.assertGreater(len(expected), 2 * self.PAGE_SIZE, "three pages needed")
+
+        def page(cursor=None):
+            records, next_cursor, prev_cursor = keyset_page(
+                model, domain, keys, self.PAGE_SIZE, fields=["id"], cursor=cursor,
+            )
+            return [rec["id"] for rec in records], next_cursor, prev_cursor
+
+        forward, cursor = [], None
+        for _i in range(3):
+            ids, cursor, prev_cursor = page(cursor)
+            forward.append((ids, prev_cursor))
+        self.assertIsNone(cursor, "the third page is the last one")
+        self.assertIsNone(forward[0][1], "the first page has no previous page")
+        self.assertEqual([rec_id for ids, _prev in forward for rec_id in ids], expected)
+
+        # Backwards from the last page: same pages, in display order.
+        cursor = forward[2][1]
+        for index in (1, 0):
+            ids, _next_cursor, cursor = page(cursor)
+            self.assertEqual(ids, forward[index][0])
+        self.assertIsNone(cursor)
+
+    def test_feed_and_history_keys(self):
+        self.assertEqual(FEED_KEYS, SCORE_HISTORY_KEYS)
+        self._walk(self.env["med.employee.score"], FEED_KEYS)
+
+    def test_scoreboard_keys(self):
+        self._walk(self.env["med.leaderboard"], SCORE_KEYS)
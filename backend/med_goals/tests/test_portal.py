@@ -0,0 +1,101 @@
+import json
+from datetime import date
+
+from odoo.tests import HttpCase, new_test_user, tagged
+
+from ..services.cache import payload_cache
+from .common import MedGoalsDataMixin
+
+
+@tagged("post_install", "-at_install")
+class TestPortalEndpoint(MedGoalsDataMixin, HttpCase):
+    """
+    /med_goals/api/portal must cost a fixed number of queries: the count
+    measured on a small cycle is pinned with assertQueryCount after the
+    scoreboard and the employee's goal history have grown.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._setup_med_goals()
+        cls.employees = cls._create_employees(6)
+        cls.cycle._compute_scores()
+        cls.user = new_test_user(
+            cls.env,
+            login="med_portal",
+            groups="base.group_user,med_goals.group_med_goals_user",
+        )
+        cls.employee = cls.employees[0]
+        cls.employee.user_id = cls.user
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate("med_portal", "med_portal")
+
+    def _portal(self, **params):
+        response = self.url_open(
+            "/med_goals/api/portal",
+            data=json.dumps({"jsonrpc": "2.0", "method": "call", "params": params}),
+            headers={"Content-Type": "application/json"},
+        )
+        self.assertEqual(response.status_code, 200)
+        result = response.json()["result"]
+        self.assertEqual(result["status"], "ok", result)
+        return result
+
+    def _cold_portal_query_count(self, **params):
+        """Queries of a portal call with warm ormcaches and an empty payload cache."""
+        self._portal(**params)
+        payload_cache.bump_generation()
+        self.env.flush_all()
+        count = self.cr.sql_log_count
+        self._portal(**params)
+        return self.cr.sql_log_count - count
+
+    def _grow(self):
+        # A bigger scoreboard...
+        self._create_employees(40, prefix="Colleague")
+        self.cycle._compute_scores()
+        # ...and a past cycle adding goals to the employee's history.
+        past = self._create_cycle("2025-Q4", date(2025, 10, 1), date(2025, 12, 31))
+        self.env["med.goal.assignment"].create([
+            {
+                "employee_id": self.employee.id,
+                "goal_id": goal.id,
+                "evaluation_cycle_id": past.id,
+                "company_id": self.company.id,
+                "target_value": goal.default_target_value,
+                "actual_value": goal.default_target_value / 2,
+            }
+            for goal in self.goals
+        ])
+        past.state = "closed"
+
+    def test_portal_payload(self):
+        result = self._portal()
+        self.assertEqual(result["employee_id"], self.employee.id)
+        self.assertEqual(result["last_cycle"]["id"], self.cycle.id)
+        self.assertTrue(result["my_score"])
+        self.assertTrue(result["top_performers"])
+        self.assertEqual(
+            len(result["my_goals"]),
+            self.env["med.goal.assignment"].search_count([
+                ("employee_id", "=", self.employee.id),
+                ("evaluation_cycle_id", "=", self.cycle.id),
+            ]),
+        )
+
+    def assertFlatQueryCount(self, **params):
+        baseline = self._cold_portal_query_count(**params)
+        self._grow()
+        self._portal(**params)
+        payload_cache.bump_generation()
+        with self.assertQueryCount(baseline):
+            self._portal(**params)
+
+    def test_portal_query_count(self):
+        self.assertFlatQueryCount()
+
+    def test_portal_all_goals_query_count(self):
+        self.assertFlatQueryCount(all_goals=True)
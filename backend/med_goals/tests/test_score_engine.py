@@ -0,0 +1,89 @@
+import unittest
+
+from odoo.tests import tagged
+
+from ..services.score_engine import (
+    EconomicStrategy,
+    GoalsStrategy,
+    ProductivityStrategy,
+    QualityStrategy,
+    ScoreEngine,
+    ScoreEngineFactory,
+)
+from ..services.vectorized_engine import VectorizedScoreEngine, np
+from .common import MedGoalsCase
+
+COMPONENTS = ("goals", "productivity", "quality", "economic", "total")
+PARITY_DELTA = 1e-9
+
+
+@tagged("post_install", "-at_install")
+class TestScoreEngine(MedGoalsCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.employees = cls._create_employees(40)
+        cls.assignments = cls.env["med.goal.assignment"].search([
+            ("evaluation_cycle_id", "=", cls.cycle.id),
+            ("state", "!=", "cancelled"),
+        ])
+
+    def _engine(self, engine_cls, strategies=None, **kwargs):
+        factory_engine = ScoreEngineFactory.from_cycle(self.env, self.cycle)
+        return engine_cls(
+            self.env,
+            self.cycle,
+            factory_engine.weights,
+            strategies or factory_engine.strategies.values(),
+            **kwargs,
+        )
+
+    def assertBreakdownsEqual(self, actual, expected):
+        self.assertEqual(set(actual), set(expected))
+        for employee_id, breakdown in expected.items():
+            for key in COMPONENTS:
+                self.assertAlmostEqual(
+                    actual[employee_id][key],
+                    breakdown[key],
+                    delta=PARITY_DELTA,
+                    msg=f"{key} of employee {employee_id}",
+                )
+
+    def test_batch_matches_per_employee(self):
+        engine = self._engine(ScoreEngine)
+        expected = {
+            employee.id: engine.compute_components(
+                employee, self.assignments.filtered(lambda a: a.employee_id == employee)
+            )
+            for employee in self.employees
+        }
+        self.assertBreakdownsEqual(engine.compute_batch(self.assignments), expected)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_vectorized_matches_python_kernel(self):
+        for use_log_rollup in (False, True):
+            with self.subTest(use_log_rollup=use_log_rollup):
+                expected = self._engine(ScoreEngine, use_log_rollup=use_log_rollup).compute_batch(self.assignments)
+                actual = self._engine(
+                    VectorizedScoreEngine, use_log_rollup=use_log_rollup
+                ).compute_batch(self.assignments)
+                self.assertBreakdownsEqual(actual, expected)
+
+    def test_log_window_excludes_next_day(self):
+        # Employees 0, 3, 6... log 1.5 + i % 4 and 2.0 inside the cycle and
+        # 50.0 at midnight after it; employee 6 has no productivity goal.
+        employee = self.employees[6]
+        totals = self._engine(ScoreEngine).performance_log_totals(employee.ids)
+        self.assertAlmostEqual(totals[employee.id], 1.5 + 6 % 4 + 2.0, delta=PARITY_DELTA)
+
+    def test_vectorized_keeps_custom_strategies(self):
+        class FlatQuality(QualityStrategy):
+            def compute(self, engine, employee, assignments):
+                return 7.0
+
+        strategies = [GoalsStrategy(), ProductivityStrategy(), FlatQuality(), EconomicStrategy()]
+        engine = self._engine(VectorizedScoreEngine, strategies=strategies)
+        self.assertFalse(engine.is_vectorizable())
+        breakdowns = engine.compute_batch(self.assignments)
+        self.assertTrue(breakdowns)
+        self.assertTrue(all(b["quality"] == 7.0 for b in breakdowns.values()))
@@ -1,6 +1,7 @@
 import {
   getEmployees,
   getMedGoalsEmployeeDetail,
+  getScoreHistory,
   getPerformanceLogs,
   getEmployeeDetail,
   Employee,
@@ -32,14 +33,15 @@ export default async function ActivityHistoryPage({
     const id = parseInt(employee_id);
 
     // Ejecutamos en paralelo para velocidad
-    const [medGoalsData, logs, detail] = await Promise.all([
+    const [medGoalsData, history, logs, detail] = await Promise.all([
       getMedGoalsEmployeeDetail(id),
+      getScoreHistory(id, { limit: 500 }), // Historial completo para las gráficas
       getPerformanceLogs({ employee_id: id }),
       getEmployeeDetail(id), // Para datos básicos como avatar
     ]);
 
     selectedEmployeeData = medGoalsData.employee; // Datos básicos del endpoint custom
-    scoreHistory = medGoalsData.score_history || [];
+    scoreHistory = history.records || [];
     performanceLogs = logs || [];
     empDetail = detail; // Datos detallados (HR)
   }
@@ -1,13 +1,13 @@
-import { getCurrentUserProfile, getMyGoals } from '@/lib/odoo';
+import { getEmployeeDetail, getPortalData } from '@/lib/odoo';
 import Link from 'next/link';
 import LogoutButton from './LogoutButton'; // Importamos el componente cliente
 import '../employees/[id]/profile.css'; 
 import './my-goals.css'; 
 
 export default async function MyProfilePage() {
-  const emp = await getCurrentUserProfile();
-  const goalsResponse = await getMyGoals();
-  const myGoals = goalsResponse.records || [];
+  const portal = await getPortalData({ all_goals: true });
+  const emp = portal ? await getEmployeeDetail(portal.employee_id) : null;
+  const myGoals = portal?.my_goals || [];
 
   if (!emp) {
     return <div className="p-8 text-center">No se pudo cargar el perfil del usuario.</div>;
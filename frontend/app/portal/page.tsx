@@ -1,9 +1,9 @@
-import { getDashboardData } from '@/lib/odoo';
+import { getPortalData } from '@/lib/odoo';
 import Link from 'next/link';
 import './dashboard.css';
 
 export default async function DashboardPage() {
-  const data = await getDashboardData();
+  const data = await getPortalData();
 
   if (!data) {
     return <div className="p-8 text-center text-gray-500">Cargando dashboard...</div>;
@@ -157,6 +157,11 @@ export interface DashboardResponse {
     top_performers: any[];
 }
 
+export interface PortalResponse extends DashboardResponse {
+    employee_id: number;
+    my_goals: any[];
+}
+
 
 // --- ENDPOINTS ---
 
@@ -347,6 +352,20 @@ export async function getMedGoalsEmployeeDetail(id: number): Promise<MedGoalsEmp
     if (response.result) {return response.result as MedGoalsEmployeeResponse;}
     return { status: 'error', message: 'Failed to fetch extended details' };
 }
+export interface ScoreHistoryPage {
+    status: 'ok' | 'error';
+    message?: string;
+    records?: ScoreHistoryRecord[];
+    count?: number;
+    columns?: Record<string, any[]>;
+    next_cursor: string | null;
+    prev_cursor: string | null;
+}
+export async function getScoreHistory(id: number, options?: { limit?: number; cursor?: string; fields?: string[]; since?: string; format?: 'rows' | 'columnar' }): Promise<ScoreHistoryPage> {
+    const response = await odooJsonApi(`/med_goals/api/employees/${id}/scores`, {jsonrpc: '2.0',method: 'call',params: {...(options || {})},});
+    if (response.result) {return response.result as ScoreHistoryPage;}
+    return { status: 'error', message: 'Failed to fetch score history', next_cursor: null, prev_cursor: null };
+}
 export async function getCurrentUserProfile() {
     const goalsData = await getMyGoals();
     if (goalsData.status === 'ok' && goalsData.employee_id) {
@@ -360,8 +379,13 @@ export async function getDashboardData(): Promise<DashboardResponse | null> {
     if (response.result && response.result.status === 'ok') {return response.result as DashboardResponse;}
     return null;
 }
+export async function getPortalData(options?: { cycle_id?: number; all_goals?: boolean; top_limit?: number }): Promise<PortalResponse | null> {
+    const response = await odooJsonApi('/med_goals/api/portal', {jsonrpc: '2.0',method: 'call',params: {...(options || {})},});
+    if (response.result && response.result.status === 'ok') {return response.result as PortalResponse;}
+    return null;
+}
 export interface PerformanceLog {id: number;name: string;date: string;metric_value: number;notes: string;employee: { id: number; name: string } | null;assignment: { id: number; name: string } | null;}
-export async function getPerformanceLogs(filters?: { employee_id?: number; assignment_id?: number }): Promise<PerformanceLog[]> {
+export async function getPerformanceLogs(filters?: { employee_id?: number; assignment_id?: number; cycle_id?: number; date_from?: string; date_to?: string; limit?: number; cursor?: string }): Promise<PerformanceLog[]> {
     const response = await odooJsonApi('/med_goals/api/performance_logs', {jsonrpc: '2.0',method: 'call',params: {...(filters || {})},});
     if (response.result && response.result.status === 'ok') {return response.result.records as PerformanceLog[];}
     return [];